@@ -0,0 +1 @@
+"""Performance benchmarks for the assistant bot (not shipped with the package)"""
@@ -0,0 +1,60 @@
+"""Synthetic address books for benchmarks"""
+
+import random
+from datetime import date, timedelta
+
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+
+FIRST_NAMES = [
+    "Olena", "Ivan", "Petro", "Mariia", "Andrii", "Oksana", "Taras", "Iryna",
+    "Dmytro", "Natalia", "Serhii", "Yulia", "Bohdan", "Sofiia", "Maksym", "Anna",
+]
+LAST_NAMES = [
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko",
+    "Oliinyk", "Melnyk", "Boyko", "Moroz", "Lysenko", "Savchenko", "Rudenko",
+]
+CITIES = ["Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro", "Poltava"]
+STREETS = ["Khreshchatyk", "Shevchenka", "Franka", "Sadova", "Hrushevskoho"]
+WORDS = [
+    "call", "buy", "meeting", "project", "milk", "report", "birthday", "gift",
+    "doctor", "train", "deadline", "review", "invoice", "plan", "book",
+]
+TAGS = ["work", "home", "shopping", "family", "urgent", "ideas", "travel"]
+
+
+def generate_record(index: int, rng: random.Random) -> Record:
+    """One contact with the field mix seen in real books"""
+    record = Record(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}")
+
+    for _ in range(rng.choice((0, 1, 1, 1, 2))):
+        record.add_phone(f"380{rng.randrange(10**9):09d}")
+    if rng.random() < 0.6:
+        record.add_email(f"user{index}@example.com")
+    if rng.random() < 0.5:
+        record.set_address(
+            f"{rng.choice(CITIES)}, {rng.choice(STREETS)} {rng.randrange(1, 200)}"
+        )
+    if rng.random() < 0.8:
+        birthday = date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55))
+        record.set_birthday(birthday.strftime("%d.%m.%Y"))
+
+    return record
+
+
+def generate_note(rng: random.Random) -> Note:
+    text = " ".join(rng.choice(WORDS) for _ in range(rng.randrange(2, 10)))
+    return Note(text, rng.sample(TAGS, rng.randrange(0, 3)))
+
+
+def generate_repository(
+    contacts: int, notes: int = 0, seed: int = 30
+) -> ContactRepository:
+    """Repository with `contacts` contacts and `notes` notes, reproducible by seed"""
+    rng = random.Random(seed)
+    repository = ContactRepository()
+    for index in range(contacts):
+        repository.add_contact(generate_record(index, rng))
+    repository.notes = [generate_note(rng) for _ in range(notes)]
+    return repository
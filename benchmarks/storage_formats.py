@@ -0,0 +1,71 @@
+"""Compare file size and save/load time of the snapshot storage formats.
+
+Usage: python -m benchmarks.storage_formats [contacts]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.data_generator import generate_repository
+from storage.factory import StorageFactory
+
+FORMATS = ["pkl", "json", "jsonl", "bin", "mmap"]
+
+
+def measure(storage_type: str, repository, base_path: Path) -> dict:
+    storage = StorageFactory.create_storage(storage_type, base_path)
+
+    started = time.perf_counter()
+    storage.save(repository)
+    save_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    loaded = storage.load()
+    load_seconds = time.perf_counter() - started
+    check_round_trip(storage_type, repository, loaded)
+
+    return {
+        "format": storage_type,
+        "size_bytes": storage.file_path.stat().st_size,
+        "save_seconds": save_seconds,
+        "load_seconds": load_seconds,
+    }
+
+
+def check_round_trip(storage_type: str, repository, loaded) -> None:
+    """Raise RuntimeError unless loaded holds the contacts and notes saved"""
+    if loaded is None:
+        raise RuntimeError(f"{storage_type}: the saved book did not load")
+    if _contact_dicts(loaded) != _contact_dicts(repository):
+        raise RuntimeError(f"{storage_type}: contacts differ after a round trip")
+    if _note_dicts(loaded) != _note_dicts(repository):
+        raise RuntimeError(f"{storage_type}: notes differ after a round trip")
+
+
+def _contact_dicts(repository) -> list:
+    return [record.to_dict() for record in repository.contacts.values()]
+
+
+def _note_dicts(repository) -> list:
+    return [note.to_dict() for note in repository.notes]
+
+
+def main():
+    contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repository = generate_repository(contacts, notes=contacts // 10)
+
+    print(f"{contacts} contacts, {contacts // 10} notes")
+    print(f"{'format':<8} {'size, MB':>10} {'save, s':>10} {'load, s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for storage_type in FORMATS:
+            result = measure(storage_type, repository, Path(directory))
+            print(
+                f"{result['format']:<8} {result['size_bytes'] / 2**20:>10.2f} "
+                f"{result['save_seconds']:>10.3f} {result['load_seconds']:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
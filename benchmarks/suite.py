@@ -0,0 +1,235 @@
+"""Latency and peak memory of the hot paths on synthetic address books.
+
+Covers the memory a generated book occupies, search, birthdays, note
+search and save/load of every storage format; each format must load back
+the contacts and notes it saved. Results are printed as a
+table and, with --output, written as JSON so runs can be compared over time.
+
+Usage: python -m benchmarks.suite [--sizes 1k 100k 1m] [--repeat 5]
+                                  [--output results.json]
+                                  [--baseline previous.json]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.data_generator import generate_repository
+from benchmarks.storage_formats import check_round_trip
+from handlers.birthday_service import BirthdayService
+from storage.factory import StorageFactory
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+# Notes generated per contact
+NOTES_RATIO = 0.1
+STORAGE_FORMATS = ["pkl", "json", "jsonl", "bin", "mmap"]
+RESULTS_VERSION = 1
+
+
+def measure(name: str, size: int, func, repeat: int, setup=None) -> dict:
+    """Time func `repeat` times, then run it once more under tracemalloc.
+
+    setup, if given, runs before every call outside the measured time.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "benchmark": name,
+        "contacts": size,
+        "repeat": repeat,
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run_size(size: int, repeat: int, formats: list) -> list[dict]:
+    repository, build = build_repository(size)
+    names = list(repository.contacts)
+    probe = names[len(names) // 2]
+    query = probe.split()[0].lower()
+    typo = probe[:-1].lower() + "x"
+    birthdays = BirthdayService(repository)
+
+    hot_paths = {
+        "search.exact": lambda: repository.search_contacts(query),
+        "search.exact_scan": lambda: repository.search_service.exact_search(
+            repository.contacts, query
+        ),
+        "search.fuzzy": lambda: repository.search_closest_contacts(typo),
+        "repository.find_contact": lambda: repository.find_contact(probe),
+        "birthdays.find_near_7": lambda: birthdays.find_near(7),
+        "birthdays.find_near_365": lambda: birthdays.find_near(365),
+        "notes.search": lambda: repository.search_notes("milk"),
+    }
+
+    results = [
+        build,
+        measure(
+            "search.index_build",
+            size,
+            lambda: repository.search_index,
+            repeat,
+            setup=lambda: _drop_index(repository),
+        )
+    ]
+    for name, func in hot_paths.items():
+        results.append(measure(name, size, func, repeat))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for storage_type in formats:
+            storage = StorageFactory.create_storage(storage_type, Path(directory))
+            results.append(
+                measure(
+                    f"storage.{storage_type}.save",
+                    size,
+                    lambda: storage.save(repository),
+                    repeat,
+                )
+            )
+            results[-1]["size_bytes"] = storage.file_path.stat().st_size
+            results.append(
+                measure(f"storage.{storage_type}.load", size, storage.load, repeat)
+            )
+            check_round_trip(storage_type, repository, storage.load())
+    return results
+
+
+def build_repository(size: int):
+    """Generate the book once under tracemalloc; also record what it keeps"""
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        repository = generate_repository(size, notes=int(size * NOTES_RATIO))
+        elapsed = time.perf_counter() - started
+        resident_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return repository, {
+        "benchmark": "repository.build",
+        "contacts": size,
+        "repeat": 1,
+        "min_seconds": elapsed,
+        "median_seconds": elapsed,
+        "peak_bytes": peak_bytes,
+        "resident_bytes": resident_bytes,
+    }
+
+
+def _drop_index(repository):
+    # The index is built on first use; dropping it makes the next use rebuild it
+    repository._search_index = None
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": RESULTS_VERSION,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+    }
+
+
+def parse_size(value: str) -> int:
+    if value.lower() in SIZES:
+        return SIZES[value.lower()]
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Size must be a number or one of: {', '.join(SIZES)}"
+        )
+
+
+def load_baseline(path: Path) -> dict:
+    """Results of an earlier run keyed by (benchmark, contacts)"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {(r["benchmark"], r["contacts"]): r for r in data["results"]}
+
+
+def change(result: dict, baseline: dict) -> str:
+    previous = baseline.get((result["benchmark"], result["contacts"]))
+    if previous is None or not previous["median_seconds"]:
+        return "-"
+    ratio = result["median_seconds"] / previous["median_seconds"] - 1
+    return f"{ratio:+.1%}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", nargs="+", type=parse_size, default=[SIZES["1k"], SIZES["100k"]]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--formats", nargs="+", choices=STORAGE_FORMATS, default=STORAGE_FORMATS
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument(
+        "--baseline", type=Path, help="JSON results of an earlier run to compare with"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+    results = []
+    print(
+        f"{'benchmark':<26} {'contacts':>9} {'median, ms':>11} {'peak, MB':>9}"
+        + (f" {'vs baseline':>12}" if baseline else "")
+    )
+    for size in args.sizes:
+        for result in run_size(size, args.repeat, args.formats):
+            results.append(result)
+            print(
+                f"{result['benchmark']:<26} {result['contacts']:>9} "
+                f"{result['median_seconds'] * 1000:>11.2f} "
+                f"{result['peak_bytes'] / 2**20:>9.2f}"
+                + (f" {change(result, baseline):>12}" if baseline else "")
+            )
+            sys.stdout.flush()
+
+    if args.output:
+        args.output.write_text(
+            json.dumps({"environment": environment(), "results": results}, indent=2),
+            encoding="utf-8",
+        )
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Non-interactive execution of command scripts through CommandHandler.
+
+A script holds one command per line, either as typed at the prompt
+("birthdays 7") or as a JSON object whose "input" list answers the
+command's prompts in order:
+
+    {"command": "add", "input": ["John Doe", "380501234567", "", "", ""]}
+    {"command": "search-contacts", "args": ["john", "--limit", "10"]}
+
+Blank lines and lines starting with "#" are skipped. A prompt without a
+scripted answer fails the command instead of waiting for the terminal;
+commands ask all their questions before changing the book, so such a
+line leaves it as it was.
+"""
+
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+
+from cli.command_suggester import CommandSuggester
+from cli.presenter import Presenter
+from handlers.command_handler import CommandHandler
+from utils.utils import parse_user_input_data
+
+EXIT_COMMANDS = ("close", "exit", "quit")
+# Colors of Presenter prompts, left out of error messages
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class ScriptedInput:
+    """input() replacement answering prompts from a list of strings"""
+
+    def __init__(self):
+        self._answers = iter(())
+        # Set when a prompt found no answer left
+        self.exhausted = False
+
+    def feed(self, answers):
+        self._answers = iter(answers)
+        self.exhausted = False
+
+    def __call__(self, prompt=""):
+        try:
+            return str(next(self._answers))
+        except StopIteration:
+            self.exhausted = True
+            prompt = ANSI_ESCAPE.sub("", prompt).strip()
+            raise EOFError(f"no scripted answer for prompt {prompt!r}") from None
+
+
+def parse_line(line: str):
+    """(command, args, answers) of a script line, or None for blank/comment"""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if not line.startswith("{"):
+        command, *args = parse_user_input_data(line)
+        return command, args, []
+
+    entry = json.loads(line)
+    command = entry.get("command")
+    args = entry.get("args", [])
+    answers = entry.get("input", [])
+    if not isinstance(command, str) or not command.strip():
+        raise ValueError('"command" must be a non-empty string')
+    if not isinstance(args, list) or not isinstance(answers, list):
+        raise ValueError('"args" and "input" must be lists')
+    return command.strip().lower(), [str(arg) for arg in args], answers
+
+
+class BatchRunner:
+    """Runs script lines against a repository and saves it through storage.
+
+    The repository is saved every save_every commands (if given) and once
+    at the end; storages that write through only commit at the end.
+    Per-command timings are collected for report().
+    """
+
+    def __init__(self, storage, repository, save_every: int = None):
+        self.storage = storage
+        self.repository = repository
+        self.save_every = save_every
+        self.scripted_input = ScriptedInput()
+        self.handler = CommandHandler(repository, input_func=self.scripted_input)
+        self.suggester = CommandSuggester()
+        self.timings = defaultdict(list)
+        self.failed = 0
+        self.saves = 0
+
+    def run(self, lines) -> bool:
+        """Execute every line; False if any line could not be run"""
+        executed = 0
+        try:
+            for number, line in enumerate(lines, 1):
+                try:
+                    parsed = parse_line(line)
+                except ValueError as e:
+                    # json.JSONDecodeError is a ValueError too
+                    self._fail(number, f"invalid line: {e}")
+                    continue
+                if parsed is None:
+                    continue
+
+                command, args, answers = parsed
+                if command in EXIT_COMMANDS:
+                    break
+                if not self.handler[command]:
+                    self._fail(number, self.suggester.get_suggestion_message(command))
+                    continue
+
+                try:
+                    self._execute(command, args, answers)
+                except Exception as e:
+                    self._fail(number, f"unexpected error in {command}: {e}")
+                    continue
+                if self.scripted_input.exhausted:
+                    # The handler reported it already; the script is still wrong
+                    self._fail(number, f"{command} needs more answers in \"input\"")
+                executed += 1
+                if self._periodic_save_due(executed):
+                    self._save()
+        finally:
+            self._save()
+        return not self.failed
+
+    def report(self, stream=None):
+        """Print count, total, mean and max time of every command"""
+        stream = stream or sys.stderr
+        stream.write(
+            f"{'command':<18} {'count':>7} {'total, ms':>11} "
+            f"{'mean, ms':>10} {'max, ms':>9}\n"
+        )
+        for command, timings in sorted(self.timings.items()):
+            total = sum(timings)
+            stream.write(
+                f"{command:<18} {len(timings):>7} {total * 1000:>11.2f} "
+                f"{total / len(timings) * 1000:>10.3f} {max(timings) * 1000:>9.3f}\n"
+            )
+        commands = sum(len(timings) for timings in self.timings.values())
+        stream.write(
+            f"Commands: {commands}, failed lines: {self.failed}, saves: {self.saves}\n"
+        )
+
+    def _execute(self, command: str, args: list, answers: list):
+        self.scripted_input.feed(answers)
+        started = time.perf_counter()
+        with self.repository.lock:
+            result = self.handler[command](*args)
+        self.timings[command].append(time.perf_counter() - started)
+        if result:
+            print(result)
+
+    def _fail(self, number: int, message: str):
+        self.failed += 1
+        print(Presenter.error(f"Line {number}: {message}"), file=sys.stderr)
+
+    def _periodic_save_due(self, executed: int) -> bool:
+        # Write-through storages have every change on disk already
+        if not self.save_every or self.storage.writes_through:
+            return False
+        return executed % self.save_every == 0
+
+    def _save(self):
+        self.storage.save(self.repository)
+        self.saves += 1
@@ -0,0 +1,116 @@
+"""Non-interactive birthday reminders for a date range, e.g. for a nightly job.
+
+Usage: assistant-bot-G30-birthdays [--storage pkl] [--from DD.MM.YYYY]
+                                   [--days 90 | --to DD.MM.YYYY] [--json]
+"""
+
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+
+from handlers.birthday_service import DATE_OUTPUT_FORMAT, BirthdayService
+from repositories.contact_repository import ContactRepository
+from storage.factory import StorageFactory
+
+DEFAULT_DAYS = 90
+
+
+def parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, DATE_OUTPUT_FORMAT).date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date: {value}. Expected format: DD.MM.YYYY"
+        )
+
+
+def build_report(groups: dict, start: date, end: date) -> dict:
+    """JSON-ready report of the groups returned by BirthdayService.find_in_range"""
+    return {
+        "from": start.strftime(DATE_OUTPUT_FORMAT),
+        "to": end.strftime(DATE_OUTPUT_FORMAT),
+        "days": [
+            {
+                "date": day.strftime(DATE_OUTPUT_FORMAT),
+                "weekday": day.strftime("%A"),
+                "birthdays": birthdays,
+            }
+            for day, birthdays in groups.items()
+        ],
+    }
+
+
+def format_report(groups: dict, start: date, end: date) -> str:
+    lines = [
+        f"Birthdays from {start.strftime(DATE_OUTPUT_FORMAT)} "
+        f"to {end.strftime(DATE_OUTPUT_FORMAT)}"
+    ]
+    if not groups:
+        lines.append("No birthdays in this period.")
+
+    for day, birthdays in groups.items():
+        lines.append("")
+        lines.append(f"{day.strftime('%A')} {day.strftime(DATE_OUTPUT_FORMAT)}")
+        for row in birthdays:
+            line = f"  {row['name']}: {row['age']} years"
+            if row["is_jubilee"]:
+                line += f" ({row['jubilee_type']})"
+            if row["is_shifted"]:
+                line += (
+                    f", birthday on {row['shift_reason']} "
+                    f"{row['actual_birthday_date']}"
+                )
+            if row["phone"]:
+                line += f", phone: {row['phone']}"
+            if row["email"]:
+                line += f", email: {row['email']}"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--storage",
+        default="pkl",
+        choices=StorageFactory.get_supported_types(),
+        help="storage format of the address book (default: pkl)",
+    )
+    parser.add_argument(
+        "--from", dest="start", type=parse_date, help="first day (default: today)"
+    )
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument(
+        "--days",
+        type=int,
+        default=DEFAULT_DAYS,
+        help=f"days after the first one (default: {DEFAULT_DAYS})",
+    )
+    period.add_argument("--to", dest="end", type=parse_date, help="last day")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    start = args.start or date.today()
+    end = args.end or start + timedelta(days=args.days)
+    if end < start:
+        parser.error("the last day is before the first one")
+
+    storage = StorageFactory.create_storage(args.storage)
+    # Storage messages go to stderr so that stdout stays a clean report
+    with redirect_stdout(sys.stderr):
+        repository = storage.load_latest_valid()
+    if not isinstance(repository, ContactRepository):
+        repository = ContactRepository()
+
+    groups = BirthdayService(repository).find_in_range(start, end)
+    if args.json:
+        json.dump(build_report(groups, start, end), sys.stdout, ensure_ascii=False)
+        print()
+    else:
+        print(format_report(groups, start, end))
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,8 @@ class CommandSuggester:
         "ne",
         "search-contacts",
         "birthdays",
+        "import",
+        "export",
         "help",
         "close",
         "tag",
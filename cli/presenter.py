@@ -1,5 +1,8 @@
 """Presenter for handling all user-facing output with colorama and Rich"""
 
+import sys
+from collections.abc import Iterable
+
 from colorama import Fore, Style, init
 from rich.console import Console
 from rich.panel import Panel
@@ -9,6 +12,28 @@ from .table_renderer import TableRenderer
 # Initialize colorama
 init(autoreset=True)
 
+# Contacts formatted before each write to the terminal
+RENDER_BATCH = 200
+CONTACTS_HEADER = (
+    f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}\n"
+    f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Contact Information':<90}"
+    f"{Style.RESET_ALL}\n"
+    f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}\n"
+)
+CONTACT_ROW = (
+    f"{Fore.YELLOW}{{idx:<4}}{Style.RESET_ALL} {Fore.MAGENTA}{{name:<20}}"
+    f"{Style.RESET_ALL}\n"
+    f"{'':26}{Fore.CYAN}Phones:{Style.RESET_ALL}   {Fore.GREEN}{{phones}}"
+    f"{Style.RESET_ALL}\n"
+    f"{'':26}{Fore.CYAN}Emails:{Style.RESET_ALL}   {Fore.GREEN}{{emails}}"
+    f"{Style.RESET_ALL}\n"
+    f"{'':26}{Fore.CYAN}Address:{Style.RESET_ALL}  {Fore.GREEN}{{address}}"
+    f"{Style.RESET_ALL}\n"
+    f"{'':26}{Fore.CYAN}Birthday:{Style.RESET_ALL} {Fore.GREEN}{{birthday}}"
+    f"{Style.RESET_ALL}\n"
+    f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}\n"
+)
+
 
 class Presenter:
     """Handles all user-facing output with colorama colors"""
@@ -74,56 +99,47 @@ class Presenter:
         print(Presenter.header(message))
 
     @staticmethod
-    def print_contacts_table(contacts):
-        """Print contacts in a formatted table with colors"""
-        if not contacts:
-            print(Presenter.info("No contacts stored."))
-            return
-
-        # Header
-        print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-        print(
-            f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Contact Information':<90}{Style.RESET_ALL}"
-        )
-        print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-
-        # Print each contact
-        for idx, contact in enumerate(contacts, 1):
-            # Get all phones in one line
-            phones = (
-                "; ".join(p.value for p in contact.phones) if contact.phones else "-"
-            )
-
-            # Get all emails in one line
-            emails = (
-                "; ".join(e.value for e in contact.emails) if contact.emails else "-"
+    def print_contacts_table(contacts: Iterable, start: int = 1, total: int = None):
+        """Print contacts in a formatted table with colors.
+
+        contacts may be a generator: rows are formatted into a buffer that is
+        written with one call per RENDER_BATCH contacts. start numbers the
+        first row; total, when the rows are one page of a larger list, is
+        reported in the footer.
+        """
+        write = sys.stdout.write
+        buffer = []
+        shown = 0
+
+        for idx, contact in enumerate(contacts, start):
+            if not buffer and not shown:
+                buffer.append(CONTACTS_HEADER)
+            buffer.append(
+                CONTACT_ROW.format(
+                    idx=idx,
+                    name=contact.name.value,
+                    phones="; ".join(p.value for p in contact.phones) or "-",
+                    emails="; ".join(e.value for e in contact.emails) or "-",
+                    address=contact.address.value if contact.address else "-",
+                    birthday=str(contact.birthday) if contact.birthday else "-",
+                )
             )
+            shown += 1
+            if shown % RENDER_BATCH == 0:
+                write("".join(buffer))
+                buffer.clear()
 
-            # Get address
-            address = contact.address.value if contact.address else "-"
-
-            # Get birthday
-            birthday = str(contact.birthday) if contact.birthday else "-"
-
-            # Print contact info
-            print(
-                f"{Fore.YELLOW}{idx:<4}{Style.RESET_ALL} {Fore.MAGENTA}{contact.name.value:<20}{Style.RESET_ALL}"
-            )
-            print(
-                f"{'':26}{Fore.CYAN}Phones:{Style.RESET_ALL}   {Fore.GREEN}{phones}{Style.RESET_ALL}"
-            )
-            print(
-                f"{'':26}{Fore.CYAN}Emails:{Style.RESET_ALL}   {Fore.GREEN}{emails}{Style.RESET_ALL}"
-            )
-            print(
-                f"{'':26}{Fore.CYAN}Address:{Style.RESET_ALL}  {Fore.GREEN}{address}{Style.RESET_ALL}"
-            )
-            print(
-                f"{'':26}{Fore.CYAN}Birthday:{Style.RESET_ALL} {Fore.GREEN}{birthday}{Style.RESET_ALL}"
-            )
-            print(f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}")
+        if not shown:
+            print(Presenter.info("No contacts stored."))
+            return
 
-        print(f"{Fore.CYAN}Total contacts: {len(contacts)}{Style.RESET_ALL}\n")
+        if total is None or total == shown:
+            footer = f"Total contacts: {shown}"
+        else:
+            footer = f"Contacts {start}-{start + shown - 1} of {total}"
+        buffer.append(f"{Fore.CYAN}{footer}{Style.RESET_ALL}\n\n")
+        write("".join(buffer))
+        sys.stdout.flush()
 
     @staticmethod
     def print_prompt():
@@ -138,13 +154,15 @@ class Presenter:
         commands_data = [
             ["add", "Add a contact"],
             ["show", "Show a specific contact"],
-            ["all", "Show all contacts"],
+            ["all", "Show contacts page by page"],
             ["search-contacts", "Search contacts"],
             ["change", "Change contact information"],
             ["rename", "Rename a contact"],
             ["delete", "Delete a contact"],
             ["delete-phone", "Delete a phone number"],
             ["birthdays", "Get a list birthdays in N days"],
+            ["import", "Import contacts from CSV or vCard"],
+            ["export", "Export contacts or notes to a file"],
             ["note-add, na", "Add note"],
             ["note-del, nd", "Delete note"],
             ["note-list, nl", "List note(s)"],
@@ -173,25 +191,29 @@ class Presenter:
         console.print()
 
     @staticmethod
-    def print_birthdays_table(results: list[dict], days: int):
-        """Print birthdays in a formatted table with colors"""
-        if not results:
-            print(
-                Presenter.warning(
-                    f"No contacts have birthdays in the next {days} days."
-                )
-            )
-            return
+    def print_birthdays_table(results: Iterable[dict], days: int):
+        """Print birthdays in a formatted table with colors.
 
-        # Header
-        print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
-        print(
-            f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Birthday Information':<90}{Style.RESET_ALL}"
-        )
-        print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+        Rows are printed as results yields them, so a generator is rendered
+        incrementally.
+        """
+        total = jubilees = big_jubilees = shifted = 0
 
         # Print each birthday
         for idx, result in enumerate(results, 1):
+            if idx == 1:
+                # Header
+                print(f"\n{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+                print(
+                    f"{Fore.CYAN}{Style.BRIGHT}{'#':<4} {'Name':<20} {'Birthday Information':<90}{Style.RESET_ALL}"
+                )
+                print(f"{Fore.BLUE}{Style.BRIGHT}{'=' * 120}{Style.RESET_ALL}")
+
+            total = idx
+            jubilees += bool(result["is_jubilee"])
+            big_jubilees += result["jubilee_type"] == "большой юбилей"
+            shifted += bool(result["is_shifted"])
+
             # Prepare data
             jubilee = (
                 " (BIG JUBILEE)"
@@ -229,12 +251,16 @@ class Presenter:
             )
             print(f"{Fore.BLUE}{'-' * 120}{Style.RESET_ALL}")
 
-        # Statistics
-        jubilees = sum(1 for r in results if r["is_jubilee"])
-        big_jubilees = sum(1 for r in results if r["jubilee_type"] == "большой юбилей")
-        shifted = sum(1 for r in results if r["is_shifted"])
+        if not total:
+            print(
+                Presenter.warning(
+                    f"No contacts have birthdays in the next {days} days."
+                )
+            )
+            return
 
-        stats = f"Total: {len(results)} birthdays"
+        # Statistics
+        stats = f"Total: {total} birthdays"
         if jubilees:
             stats += f" | Jubilees: {jubilees} ({big_jubilees} big, {jubilees - big_jubilees} regular)"
         if shifted:
@@ -260,12 +286,23 @@ class Presenter:
         commands_contacts = [
             ("add", "Create and add new contact to storage"),
             ("show", "Show contact by name and show it"),
-            ("all", "Show all contacts"),
-            ("search-contacts", "Search contacts by name, phone, or email"),
+            ("all [--page N] [--limit N]", "Show contacts page by page"),
+            (
+                "search-contacts [query] [--page N]",
+                "Search contacts by name, phone, or email",
+            ),
             ("change", "Change contact information (interactive menu)"),
             ("rename", "Rename a contact"),
             ("delete", "Delete a contact"),
             ("delete-phone", "Delete a phone number from a contact"),
+            (
+                "import <file> [--format F] [--workers N]",
+                "Import contacts from a CSV or vCard file; bad rows go to a report",
+            ),
+            (
+                "export <file> [--search Q | --birthdays N]",
+                "Export contacts to CSV, JSON Lines or vCard (--notes: notes)",
+            ),
         ]
 
         for cmd, desc in commands_contacts:
@@ -295,9 +332,9 @@ class Presenter:
 
         commands_notes = [
             ("note-add [text] [tag1,tag2,...] or na", "Add a note"),
-            ("note-del [filter] or nd", "Delete a note"),
+            ("note-del [filter|#id] or nd", "Delete a note"),
             ("note-list [filter] or nl", "Show list of notes (with filtering)"),
-            ("note-edit [filter] or ne", "Edit a note"),
+            ("note-edit [filter|#id] or ne", "Edit a note"),
             ("tag", "Show notes sorted by tags"),
         ]
 
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Any
+from functools import cached_property, lru_cache
+from typing import Any, Iterator
 
 from models.contact import Record
 
@@ -25,24 +27,27 @@ class JubileeType(Enum):
 
 @dataclass
 class BirthdayRecord:
-    """Birthday record with useful methods."""
+    """Birthday record with useful methods.
+
+    Derived fields are computed once per record and then cached.
+    """
 
     actual_birthday: date
     contact: Record
     original_birth_date: date
 
-    @property
+    @cached_property
     def congratulation_date(self) -> date:
         """Get congratulation date (shifted to Monday if weekend)."""
         shift_days = WEEKEND_SHIFTS.get(self.actual_birthday.weekday(), 0)
         return self.actual_birthday + timedelta(days=shift_days)
 
-    @property
+    @cached_property
     def is_shifted(self) -> bool:
         """Check if date was shifted to Monday."""
         return self.congratulation_date != self.actual_birthday
 
-    @property
+    @cached_property
     def shift_reason(self) -> str:
         """Get weekend day name if shifted."""
         return (
@@ -51,12 +56,12 @@ class BirthdayRecord:
             else ""
         )
 
-    @property
+    @cached_property
     def age(self) -> int:
         """Calculate age in years."""
         return self.actual_birthday.year - self.original_birth_date.year
 
-    @property
+    @cached_property
     def jubilee_type(self) -> str:
         """Get jubilee type."""
         if self.age <= 0:
@@ -67,27 +72,59 @@ class BirthdayRecord:
             return JubileeType.REGULAR.value
         return JubileeType.NONE.value
 
+    @cached_property
+    def sort_key(self) -> tuple[date, str]:
+        """Congratulation date and lowercased name."""
+        return self.congratulation_date, self.contact.name.value.lower()
+
     def __lt__(self, other: BirthdayRecord) -> bool:
         """Compare records by congratulation date and name."""
-        if self.congratulation_date != other.congratulation_date:
-            return self.congratulation_date < other.congratulation_date
-        return self.contact.name.value.lower() < other.contact.name.value.lower()
+        return self.sort_key < other.sort_key
 
 
 class BirthdayService:
     """Service to find contacts with birthdays within a specified number of days."""
 
-    def __init__(self, repository) -> None:
-        """Initialize with a contact repository."""
+    def __init__(self, repository, vectorized: bool | None = None) -> None:
+        """Initialize with a contact repository.
+
+        vectorized selects the NumPy path of find_near/iter_near; by default
+        it is used whenever the repository provides birthday columns.
+        """
         self._repository = repository
+        self._vectorized = vectorized
 
     def find_near(self, days: int) -> list[dict[str, Any]]:
         """Find contacts with birthdays within the specified number of days."""
+        return list(self.iter_near(days))
+
+    def iter_near(self, days: int) -> Iterator[dict[str, Any]]:
+        """Yield the rows of find_near one by one, in the same order.
+
+        Birthdays come from the index in date order and a weekend shift
+        moves a congratulation at most a couple of days ahead, so a row is
+        yielded as soon as no later birthday can sort before it.
+        """
         if days < 0:
             raise ValueError("Parameter 'days' must be non-negative.")
+        return self._iter_near(days)
+
+    def _iter_near(self, days: int) -> Iterator[dict[str, Any]]:
+        columns = self._birthday_columns()
+        if columns is not None:
+            for record in self._collect_vectorized(columns, days):
+                yield self._format_record(record)
+            return
 
-        records = self._collect_records(days)
-        return [self._format_record(record) for record in sorted(records)]
+        pending = []
+        for record in self._collect_records(days):
+            # Later birthdays are congratulated on this day or after it
+            while pending and pending[0][0][0] < record.actual_birthday:
+                yield self._format_record(heapq.heappop(pending)[1])
+            heapq.heappush(pending, (record.sort_key, record))
+
+        while pending:
+            yield self._format_record(heapq.heappop(pending)[1])
 
     def find_on_date(self, target_date: str | date) -> list[dict[str, Any]]:
         """Find contacts with birthdays on a specific date (ignoring year)."""
@@ -102,29 +139,20 @@ class BirthdayService:
 
         records = []
         today = date.today()
+        index = self._repository.birthday_index
 
-        for contact in self._repository.get_all_contacts():
-            if not contact.birthday:
-                continue
-
+        # Day and month match, the year is ignored
+        for name in index.bucket(target_date.month, target_date.day):
+            contact = self._repository.find_contact(name)
             try:
                 birth_date = self._extract_date(contact.birthday)
-
-                # Check if day and month match (ignoring year)
-                if (
-                    birth_date.day == target_date.day
-                    and birth_date.month == target_date.month
-                ):
-                    # Calculate the birthday in the current year or next year
-                    birthday_this_year = self._get_next_birthday(birth_date, today)
-
-                    records.append(
-                        BirthdayRecord(
-                            actual_birthday=birthday_this_year,
-                            contact=contact,
-                            original_birth_date=birth_date,
-                        )
+                records.append(
+                    BirthdayRecord(
+                        actual_birthday=self._get_next_birthday(birth_date, today),
+                        contact=contact,
+                        original_birth_date=birth_date,
                     )
+                )
             except (TypeError, ValueError):
                 continue
 
@@ -136,30 +164,97 @@ class BirthdayService:
         """Find contacts with birthdays today."""
         return self.find_on_date(date.today())
 
-    def _collect_records(self, days: int) -> list[BirthdayRecord]:
-        """Collect contacts whose birthdays fall within the specified days."""
-        records = []
+    def find_in_range(
+        self, start: date, end: date
+    ) -> dict[date, list[dict[str, Any]]]:
+        """Find contacts to congratulate on each day from start to end.
+
+        Birthdays are grouped by congratulation date (weekend birthdays move
+        to Monday), in date order and by name within a day; days without
+        birthdays are left out. The whole range is computed in one pass, and
+        a contact appears once for every year the range covers.
+        """
+        if end < start:
+            raise ValueError("End date must not be before start date.")
+
+        index = self._repository.birthday_index
+        contacts = {}
+        groups = {}
+
+        # Weekend birthdays just before start are congratulated inside the range
+        first_day = start - timedelta(days=max(WEEKEND_SHIFTS.values()))
+        for actual_birthday, name in index.between(first_day, end):
+            contact = contacts.get(name)
+            if contact is None:
+                contact = contacts[name] = self._repository.find_contact(name)
+            try:
+                birth_date = self._extract_date(contact.birthday)
+            except (TypeError, ValueError):
+                continue
+
+            record = BirthdayRecord(
+                actual_birthday=actual_birthday,
+                contact=contact,
+                original_birth_date=birth_date,
+            )
+            if start <= record.congratulation_date <= end:
+                groups.setdefault(record.congratulation_date, []).append(record)
+
+        return {
+            day: [self._format_record(record) for record in sorted(groups[day])]
+            for day in sorted(groups)
+        }
+
+    def _collect_records(self, days: int) -> Iterator[BirthdayRecord]:
+        """Yield contacts whose birthdays fall within the days, by birthday."""
         today = date.today()
+        index = self._repository.birthday_index
 
-        for contact in self._repository.get_all_contacts():
-            if not contact.birthday:
+        # Only the day buckets inside the window are visited
+        for actual_birthday, name in index.upcoming(
+            today, today + timedelta(days=days)
+        ):
+            contact = self._repository.find_contact(name)
+            try:
+                birth_date = self._extract_date(contact.birthday)
+            except (TypeError, ValueError):
                 continue
-
+            yield BirthdayRecord(
+                actual_birthday=actual_birthday,
+                contact=contact,
+                original_birth_date=birth_date,
+            )
+
+    def _birthday_columns(self):
+        if self._vectorized is False:
+            return None
+        columns = getattr(self._repository, "birthday_columns", None)
+        if columns is None and self._vectorized:
+            raise RuntimeError("Vectorized birthdays need numpy and birthday columns.")
+        return columns
+
+    def _collect_vectorized(self, columns, days: int) -> list[BirthdayRecord]:
+        """Records of _collect_records computed with array operations, sorted."""
+        records = []
+        for name, actual_birthday, congratulation_date, age in columns.upcoming(
+            date.today(), days, WEEKEND_SHIFTS
+        ):
+            contact = self._repository.find_contact(name)
             try:
                 birth_date = self._extract_date(contact.birthday)
-                birthday_this_year = self._get_next_birthday(birth_date, today)
-
-                if 0 <= (birthday_this_year - today).days <= days:
-                    records.append(
-                        BirthdayRecord(
-                            actual_birthday=birthday_this_year,
-                            contact=contact,
-                            original_birth_date=birth_date,
-                        )
-                    )
             except (TypeError, ValueError):
                 continue
-
+            record = BirthdayRecord(
+                actual_birthday=actual_birthday,
+                contact=contact,
+                original_birth_date=birth_date,
+            )
+            # Already computed for all rows at once
+            record.congratulation_date = congratulation_date
+            record.age = age
+            records.append(record)
+
+        records.sort()
         return records
 
     def _get_next_birthday(self, birth_date: date, today: date) -> date:
@@ -194,22 +289,29 @@ class BirthdayService:
         """Format a single birthday record into a dictionary."""
         phones = [p.value for p in record.contact.phones]
         emails = [e.value for e in record.contact.emails]
+        congratulation_date, weekday = _format_day(record.congratulation_date)
+        actual_date, actual_weekday = _format_day(record.actual_birthday)
+        jubilee_type = record.jubilee_type
 
         return {
-            "date": record.congratulation_date.strftime(DATE_OUTPUT_FORMAT),
-            "weekday": record.congratulation_date.strftime(WEEKDAY_OUTPUT_FORMAT),
-            "actual_birthday_date": record.actual_birthday.strftime(DATE_OUTPUT_FORMAT),
-            "actual_birthday_weekday": record.actual_birthday.strftime(
-                WEEKDAY_OUTPUT_FORMAT
-            ),
+            "date": congratulation_date,
+            "weekday": weekday,
+            "actual_birthday_date": actual_date,
+            "actual_birthday_weekday": actual_weekday,
             "is_shifted": record.is_shifted,
             "shift_reason": record.shift_reason,
             "name": record.contact.name.value,
             "age": record.age,
-            "is_jubilee": bool(record.jubilee_type),
-            "jubilee_type": record.jubilee_type,
+            "is_jubilee": bool(jubilee_type),
+            "jubilee_type": jubilee_type,
             "phone": next(iter(phones), ""),
             "email": next(iter(emails), ""),
             "phones": phones,
             "emails": emails,
         }
+
+
+@lru_cache(maxsize=512)
+def _format_day(day: date) -> tuple[str, str]:
+    """Date and weekday strings; results share the few days of their window."""
+    return day.strftime(DATE_OUTPUT_FORMAT), day.strftime(WEEKDAY_OUTPUT_FORMAT)
@@ -1,13 +1,22 @@
+from pathlib import Path
+
 from cli.presenter import Presenter
 from models.contact import Record
 from models.note import Note
 from handlers.decorators import input_error
 from handlers.birthday_service import BirthdayService
+from handlers.export_service import ExportService
+from handlers.import_service import ImportService
+
+# Contacts per page of the all and search-contacts listings
+DEFAULT_PAGE_SIZE = 50
 
 
 class CommandHandler:
-    def __init__(self, repository):
+    def __init__(self, repository, input_func=input):
         self.repository = repository
+        # Reads every answer to a prompt; batch mode passes scripted answers
+        self.input = input_func
         self.birthday_service = BirthdayService(repository)
         self.commands = {
             "add": self.add_contact,
@@ -28,6 +37,8 @@ class CommandHandler:
             "tag": self.tag,
             "search-contacts": self.search_contacts,
             "birthdays": self.show_birthdays,
+            "import": self.import_contacts,
+            "export": self.export_data,
             "help": self._handle_help,
         }
 
@@ -44,24 +55,22 @@ class CommandHandler:
         print(Presenter.info("Press Enter to skip any optional field."))
 
         while True:
-            name = input(Presenter.highlight("Name (required): ")).strip()
+            name = self.input(Presenter.highlight("Name (required): ")).strip()
             if not name:
                 print(Presenter.error("Name is required. Please enter a name."))
                 continue
             break
 
-        contact = self.repository.find_contact(name)
-
-        if contact is None:
-            contact = Record(name)
-            self.repository.add_contact(contact)
-        else:
+        if self.repository.find_contact(name) is not None:
             return Presenter.warning(
                 "Contact already exist, please use update to modify"
             )
+        # Stored only once every field was asked, so a command interrupted
+        # halfway leaves no half-filled contact behind
+        contact = Record(name)
 
         while True:
-            phone = input(
+            phone = self.input(
                 Presenter.info("Phone (optional): ")
                 + Presenter.format_hint("[380XXXXXXXXX]")
                 + ": "
@@ -69,6 +78,7 @@ class CommandHandler:
             if not phone:
                 break
             try:
+                self.repository.ensure_unique_phone(phone, name)
                 contact.add_phone(phone)
                 break
             except Exception as e:
@@ -80,10 +90,11 @@ class CommandHandler:
                 continue
 
         while True:
-            email = input(Presenter.info("Email (optional): ")).strip()
+            email = self.input(Presenter.info("Email (optional): ")).strip()
             if not email:
                 break
             try:
+                self.repository.ensure_unique_email(email, name)
                 contact.add_email(email)
                 break
             except Exception as e:
@@ -94,12 +105,12 @@ class CommandHandler:
                 )
                 continue
 
-        address = input(Presenter.info("Address (optional): ")).strip() or None
+        address = self.input(Presenter.info("Address (optional): ")).strip() or None
         if address:
             contact.set_address(address)
 
         while True:
-            birthday = input(
+            birthday = self.input(
                 Presenter.info("Birthday (optional): ")
                 + Presenter.format_hint("[dd.mm.yyyy]")
                 + ": "
@@ -117,13 +128,14 @@ class CommandHandler:
                 )
                 continue
 
+        self.repository.add_contact(contact)
         return Presenter.success("Contact added.")
 
     @input_error
     def show_contact(self):
         """Show a specific contact"""
         while True:
-            name = input("Enter the name to show contact: ").strip()
+            name = self.input("Enter the name to show contact: ").strip()
             # Allow Enter to cancel
             if not name:
                 return None
@@ -136,12 +148,18 @@ class CommandHandler:
         return ""
 
     @input_error
-    def show_all_contacts(self):
-        """Show all contacts"""
-        contacts = self.repository.get_all_contacts()
-        if not contacts:
+    def show_all_contacts(self, *args):
+        """Show one page of contacts: all [--page N] [--limit N]"""
+        page, limit, _ = self._page_options(args)
+        total = self.repository.count_contacts()
+        if not total:
             return Presenter.warning("No contacts stored.")
-        Presenter.print_contacts_table(contacts)
+
+        offset = self._page_offset(page, limit, total)
+        Presenter.print_contacts_table(
+            self.repository.iter_contacts(offset, limit), offset + 1, total
+        )
+        self._print_page_hint("all", page, limit, total)
         return ""
 
     @input_error
@@ -149,7 +167,7 @@ class CommandHandler:
         """Change a contact field - displays interactive menu"""
         while True:
             self._display_change_menu()
-            choice = input("Enter your choice: ").strip()
+            choice = self.input("Enter your choice: ").strip()
 
             # Allow Enter to cancel
             if not choice:
@@ -168,7 +186,7 @@ class CommandHandler:
 
             # Get contact name
             while True:
-                name = input("Enter the EXISTING contact name to edit: ").strip()
+                name = self.input("Enter the EXISTING contact name to edit: ").strip()
                 # Allow Enter to cancel
                 if not name:
                     return "Return to main menu"
@@ -177,6 +195,8 @@ class CommandHandler:
             contact = self.repository.find_contact(name)
             if contact is None:
                 raise KeyError(f"Contact {name} not found.")
+            # The stored spelling, the name may have been typed in another case
+            name = contact.name.value
 
             # Handle the selected option
             result = None
@@ -211,13 +231,14 @@ class CommandHandler:
         """Handle name editing"""
         print(Presenter.info(f"\nCurrent contact name: {current_name}"))
         while True:
-            new_name = input("Enter the NEW name for this contact: ").strip()
+            new_name = self.input("Enter the NEW name for this contact: ").strip()
             # Allow Enter to cancel
             if not new_name:
                 return None
             break
 
-        if self.repository.find_contact(new_name):
+        existing = self.repository.find_contact(new_name)
+        if existing is not None and existing is not contact:
             raise ValueError(f"Contact {new_name} already exists.")
 
         self.repository.delete_contact(current_name)
@@ -234,14 +255,14 @@ class CommandHandler:
         if not contact.phones:
             print(Presenter.info("This contact has no phone numbers."))
             add_new = (
-                input("Would you like to add a new phone? (y/n): ").strip().lower()
+                self.input("Would you like to add a new phone? (y/n): ").strip().lower()
             )
             # Allow Enter to cancel
             if not add_new:
                 return None
             if add_new == "y":
                 while True:
-                    new_phone = input(
+                    new_phone = self.input(
                         "Enter new phone "
                         + Presenter.format_hint("[380XXXXXXXXX]")
                         + ": "
@@ -250,7 +271,9 @@ class CommandHandler:
                     if not new_phone:
                         return None
                     try:
+                        self.repository.ensure_unique_phone(new_phone, name)
                         contact.add_phone(new_phone)
+                        self.repository.update_contact(contact)
                         return Presenter.success(
                             f"Phone {new_phone} added to contact {name}."
                         )
@@ -268,7 +291,7 @@ class CommandHandler:
         # Get old phone selection
         while True:
             try:
-                selection = input(
+                selection = self.input(
                     "\nEnter the number of the phone to edit (or enter the phone number directly): "
                 ).strip()
                 # Allow Enter to cancel
@@ -305,14 +328,16 @@ class CommandHandler:
 
         # Get new phone
         while True:
-            new_phone = input(
+            new_phone = self.input(
                 "Enter new phone " + Presenter.format_hint("[380XXXXXXXXX]") + ": "
             ).strip()
             # Allow Enter to cancel
             if not new_phone:
                 return None
             try:
+                self.repository.ensure_unique_phone(new_phone, name)
                 contact.edit_phone(old_phone, new_phone)
+                self.repository.update_contact(contact)
                 return Presenter.success(
                     f"Phone number for {name} changed from {old_phone} to {new_phone}."
                 )
@@ -326,19 +351,21 @@ class CommandHandler:
         if not contact.emails:
             print(Presenter.info("This contact has no email addresses."))
             add_new = (
-                input("Would you like to add a new email? (y/n): ").strip().lower()
+                self.input("Would you like to add a new email? (y/n): ").strip().lower()
             )
             # Allow Enter to cancel
             if not add_new:
                 return None
             if add_new == "y":
                 while True:
-                    new_email = input("Enter new email: ").strip()
+                    new_email = self.input("Enter new email: ").strip()
                     # Allow Enter to cancel
                     if not new_email:
                         return None
                     try:
+                        self.repository.ensure_unique_email(new_email, name)
                         contact.add_email(new_email)
+                        self.repository.update_contact(contact)
                         return Presenter.success(
                             f"Email {new_email} added to contact {name}."
                         )
@@ -356,7 +383,7 @@ class CommandHandler:
         # Get old email selection
         while True:
             try:
-                selection = input(
+                selection = self.input(
                     "\nEnter the number of the email to edit (or enter the email address directly): "
                 ).strip()
                 # Allow Enter to cancel
@@ -393,12 +420,14 @@ class CommandHandler:
 
         # Get new email
         while True:
-            new_email = input("Enter new email: ").strip()
+            new_email = self.input("Enter new email: ").strip()
             # Allow Enter to cancel
             if not new_email:
                 return None
             try:
+                self.repository.ensure_unique_email(new_email, name)
                 contact.edit_email(old_email, new_email)
+                self.repository.update_contact(contact)
                 return Presenter.success(
                     f"Email for {name} changed from {old_email} to {new_email}."
                 )
@@ -412,11 +441,12 @@ class CommandHandler:
         if contact.address:
             print(Presenter.info(f"Current address: {contact.address.value}"))
 
-        new_address = input("Enter new address: ").strip()
+        new_address = self.input("Enter new address: ").strip()
         # Allow Enter to cancel
         if not new_address:
             return None
         contact.set_address(new_address)
+        self.repository.update_contact(contact)
         return Presenter.success(f"Address for {name} updated to: {new_address}.")
 
     @input_error
@@ -426,7 +456,7 @@ class CommandHandler:
             print(Presenter.info(f"Current birthday: {contact.birthday}"))
 
         while True:
-            birthday = input(
+            birthday = self.input(
                 "Enter new birthday " + Presenter.format_hint("[dd.mm.yyyy]") + ": "
             ).strip()
             # Allow Enter to cancel
@@ -435,6 +465,7 @@ class CommandHandler:
 
             try:
                 contact.set_birthday(birthday)
+                self.repository.update_contact(contact)
                 return Presenter.success(f"Birthday for {name} updated to: {birthday}.")
             except Exception as e:
                 print(Presenter.error(f"Error: {e}. Please try again."))
@@ -445,7 +476,7 @@ class CommandHandler:
         """Rename a contact"""
         print(Presenter.info("Let's update contact name. Please enter contact name"))
         while True:
-            name = input(Presenter.info("Name (required): ")).strip()
+            name = self.input(Presenter.info("Name (required): ")).strip()
             if not name:
                 print(Presenter.error("Name is required. Please enter a name."))
                 continue
@@ -455,15 +486,17 @@ class CommandHandler:
 
         if not contact:
             raise KeyError(f"Contact {name} not found.")
+        name = contact.name.value
 
         while True:
-            new_name = input(Presenter.info("New name (required): ")).strip()
+            new_name = self.input(Presenter.info("New name (required): ")).strip()
             if not new_name:
                 print(Presenter.error("New name is required. Please enter a name."))
                 continue
             break
 
-        if self.repository.find_contact(new_name):
+        existing = self.repository.find_contact(new_name)
+        if existing is not None and existing is not contact:
             raise ValueError(f"Contact {new_name} already exists.")
 
         self.repository.delete_contact(name)
@@ -477,7 +510,7 @@ class CommandHandler:
         """Delete a contact"""
         print(Presenter.info("Let's delete contact. Please enter contact name"))
         while True:
-            name = input(Presenter.info("Name (required): ")).strip()
+            name = self.input(Presenter.info("Name (required): ")).strip()
             if not name:
                 print(Presenter.error("Name is required. Please enter a name."))
                 continue
@@ -486,8 +519,9 @@ class CommandHandler:
         record = self.repository.find_contact(name)
         if record is None:
             raise KeyError(f"Contact {name} not found.")
+        name = record.name.value
         print(Presenter.warning("Do you really want to remove this contact?"))
-        response = input("(y/n): ").strip()
+        response = self.input("(y/n): ").strip()
         if response == "y":
             self.repository.delete_contact(name)
             return Presenter.success(f"Contact {name} deleted successfully.")
@@ -503,7 +537,7 @@ class CommandHandler:
             )
         )
         while True:
-            name = input(Presenter.info("Name (required): ")).strip()
+            name = self.input(Presenter.info("Name (required): ")).strip()
             if not name:
                 print(Presenter.error("Name is required. Please enter a name."))
                 continue
@@ -511,6 +545,7 @@ class CommandHandler:
         record = self.repository.find_contact(name)
         if not record:
             raise KeyError(f"Contact {name} not found.")
+        name = record.name.value
 
         Presenter.print_contacts_table([record])
 
@@ -520,7 +555,7 @@ class CommandHandler:
             )
 
         while True:
-            phone = input(Presenter.info("Phone to delete(required): ")).strip()
+            phone = self.input(Presenter.info("Phone to delete(required): ")).strip()
             if not phone:
                 print(Presenter.error("Phone is required. Please enter a value."))
                 continue
@@ -531,21 +566,28 @@ class CommandHandler:
             return Presenter.error(f"Phone {phone} not found for contact {name}.")
 
         record.remove_phone(phone)
+        self.repository.update_contact(record)
         return Presenter.success(f"Phone {phone} removed from contact {name}.")
 
     @input_error
-    def search_contacts(self) -> str:
-        while True:
-            query = input("Query string(required): ").strip()
+    def search_contacts(self, *args) -> str:
+        """search-contacts [query] [--page N] [--limit N]"""
+        page, limit, words = self._page_options(args)
+        query = " ".join(words)
+        while not query:
+            query = self.input("Query string(required): ").strip()
             if not query:
                 print("Query is required. Please enter a search value.\n")
-                continue
-            break
-        exact_results = self.repository.search_contacts(query)
+        offset = (page - 1) * limit
+        total, page_results = self.repository.search_contacts_page(
+            query, offset, limit
+        )
 
-        if exact_results:
-            print(Presenter.info(f"\nFound {len(exact_results)} contact(s):"))
-            Presenter.print_contacts_table(exact_results)
+        if total:
+            self._page_offset(page, limit, total)  # raises past the last page
+            print(Presenter.info(f"\nFound {total} contact(s):"))
+            Presenter.print_contacts_table(page_results, offset + 1, total)
+            self._print_page_hint(f"search-contacts {query}", page, limit, total)
             return ""
 
         closest = self.repository.search_closest_contacts(query)
@@ -558,6 +600,47 @@ class CommandHandler:
 
         return Presenter.warning(f"No contacts found matching '{query}'.")
 
+    @staticmethod
+    def _page_options(args) -> tuple[int, int, list]:
+        """(page, limit, other words) from --page N and --limit N arguments"""
+        options = {"--page": 1, "--limit": DEFAULT_PAGE_SIZE}
+        words = []
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            flag, _, value = arg.partition("=")
+            if flag not in options:
+                words.append(arg)
+                continue
+            if not value:
+                if not args:
+                    raise ValueError(f"{flag} needs a number.")
+                value = args.pop(0)
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"{flag} must be a positive number, got {value!r}.")
+            options[flag] = int(value)
+        return options["--page"], options["--limit"], words
+
+    @staticmethod
+    def _page_offset(page: int, limit: int, total: int) -> int:
+        pages = -(-total // limit)
+        if page > pages:
+            raise ValueError(f"Page {page} is past the last page ({pages}).")
+        return (page - 1) * limit
+
+    @staticmethod
+    def _print_page_hint(command: str, page: int, limit: int, total: int):
+        pages = -(-total // limit)
+        if page >= pages:
+            return
+        limit_option = f" --limit {limit}" if limit != DEFAULT_PAGE_SIZE else ""
+        print(
+            Presenter.info(
+                f"Page {page} of {pages}. Next: {command} --page {page + 1}"
+                f"{limit_option}"
+            )
+        )
+
     @input_error
     def show_birthdays(self, days: str) -> str:
         """Show contacts with birthdays within specified number of days"""
@@ -567,17 +650,116 @@ class CommandHandler:
             raise ValueError(
                 f"Invalid number of days: {days}. Please provide a valid integer."
             )
-        results = self.birthday_service.find_near(days_int)
+        results = self.birthday_service.iter_near(days_int)
         Presenter.print_birthdays_table(results, days_int)
         return ""
 
+    @input_error
+    def import_contacts(self, *args) -> str:
+        """import <file> [--format csv|vcard] [--workers N] [--rejects PATH]"""
+        options, words = self._file_options(
+            args, {"--format": None, "--workers": None, "--rejects": None}
+        )
+        file_format, workers = options["--format"], options["--workers"]
+        if file_format not in (None, "csv", "vcard"):
+            raise ValueError(f"--format must be csv or vcard, got {file_format!r}.")
+        if workers is not None and not workers.isdigit():
+            raise ValueError(f"--workers must be a number, got {workers!r}.")
+        path = " ".join(words)
+        while not path:
+            path = self.input(Presenter.info("File to import (.csv or .vcf): "))
+            path = path.strip()
+        if not Path(path).is_file():
+            raise ValueError(f"File {path} not found.")
+
+        service = ImportService(self.repository, workers and int(workers))
+        report = service.import_file(path, file_format, options["--rejects"])
+        print(
+            Presenter.success(
+                f"Imported {report.rows - report.rejected} of {report.rows} rows: "
+                f"{report.added} new contact(s), {report.merged} merged into existing."
+            )
+        )
+        if report.rejected:
+            reasons = ", ".join(
+                f"{reason} {count}" for reason, count in sorted(report.reasons.items())
+            )
+            print(Presenter.warning(f"Rejected {report.rejected} row(s): {reasons}."))
+            print(Presenter.warning(f"Reject report: {report.rejects_path}"))
+        return Presenter.info(
+            f"{report.rows_per_second:,.0f} rows/s ({report.seconds:.2f} s)"
+        )
+
+    @input_error
+    def export_data(self, *args) -> str:
+        """export <file> [--format F] [--notes] [--search QUERY | --birthdays N]"""
+        options, words = self._file_options(
+            args,
+            {"--format": None, "--search": None, "--birthdays": None},
+            switches=("--notes",),
+        )
+        file_format, days = options["--format"], options["--birthdays"]
+        if file_format not in (None, "csv", "jsonl", "vcard"):
+            raise ValueError(
+                f"--format must be csv, jsonl or vcard, got {file_format!r}."
+            )
+        if days is not None and not days.isdigit():
+            raise ValueError(f"--birthdays must be a number of days, got {days!r}.")
+        # Words after the file name continue the search query
+        path, *query_words = words or [""]
+        query = " ".join(filter(None, [options["--search"], *query_words]))
+        while not path:
+            path = self.input(Presenter.info("File to export to: ")).strip()
+
+        service = ExportService(self.repository)
+        if options["--notes"]:
+            if days is not None:
+                raise ValueError("--birthdays applies to contacts, not notes.")
+            report = service.export_notes(path, file_format, query)
+            exported = "note(s)"
+        else:
+            report = service.export_contacts(
+                path, file_format, query, days and int(days)
+            )
+            exported = "contact(s)"
+        print(Presenter.success(f"Exported {report.rows} {exported} to {report.path}"))
+        return Presenter.info(
+            f"{report.rows_per_second:,.0f} rows/s ({report.seconds:.2f} s)"
+        )
+
+    @staticmethod
+    def _file_options(args, options: dict, switches=()) -> tuple[dict, list]:
+        """(options, other words) of import/export arguments.
+
+        options maps each --flag taking a value to its default; switches are
+        flags without a value, set to True when present.
+        """
+        options = {**options, **dict.fromkeys(switches, False)}
+        words = []
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            flag, _, value = arg.partition("=")
+            if flag in switches:
+                options[flag] = True
+                continue
+            if flag not in options:
+                words.append(arg)
+                continue
+            if not value:
+                if not args:
+                    raise ValueError(f"{flag} needs a value.")
+                value = args.pop(0)
+            options[flag] = value
+        return options, words
+
     @input_error
     def note_add(self, text=None, tags=None):
         while not text:
-            text = input(Presenter.info("Enter note text: ")).strip()
+            text = self.input(Presenter.info("Enter note text: ")).strip()
 
         if tags is None:
-            raw = input(
+            raw = self.input(
                 Presenter.info(
                     "Enter tags separated by commas (or press Enter to continue): "
                 )
@@ -596,11 +778,18 @@ class CommandHandler:
 
     @input_error
     def note_del(self, query=None):
+        note_id = self._note_id(query)
+        if note_id is not None:
+            note = self.repository.get_note(note_id)
+            if note is None:
+                return Presenter.warning(f"Note #{note_id} not found.")
+            return self.repository.del_note(note)
+
         while True:
             notes, msg = self.repository.search_notes(query)
             print(msg)
 
-            query = input(
+            query = self.input(
                 Presenter.info("Enter a search string (or press Enter to continue): ")
             ).strip()
             if not query:
@@ -610,25 +799,20 @@ class CommandHandler:
             return "No notes to delete. Deletion cancelled."
 
         while True:
-            user_input = input(
+            user_input = self.input(
                 Presenter.info(
-                    f"Enter the number of the note to delete 1-{len(notes)} (or press Enter to exit): "
+                    f"Enter the number of the note to delete 1-{len(notes)} "
+                    "or its #id (or press Enter to exit): "
                 )
             ).strip()
 
             if not user_input:
                 break
 
-            try:
-                index = int(user_input)
-                if not 1 <= index <= len(notes):
-                    print(Presenter.warning("Invalid number. Try again."))
-                    continue
-            except ValueError:
-                print(Presenter.warning("Please enter a valid number."))
+            note_to_delete = self._pick_note(notes, user_input)
+            if note_to_delete is None:
                 continue
 
-            note_to_delete = notes[index - 1]
             print(self.repository.del_note(note_to_delete))
             break
 
@@ -640,7 +824,7 @@ class CommandHandler:
             notes, msg = self.repository.search_notes(query)
             print(msg)
 
-            query = input(
+            query = self.input(
                 Presenter.info("Enter a search string (or press Enter to exit): ")
             ).strip()
             if not query:
@@ -650,11 +834,18 @@ class CommandHandler:
 
     @input_error
     def note_edit(self, query=None):
+        note_id = self._note_id(query)
+        if note_id is not None:
+            note = self.repository.get_note(note_id)
+            if note is None:
+                return Presenter.warning(f"Note #{note_id} not found.")
+            return self._edit_note(note)
+
         while True:
             notes, msg = self.repository.search_notes(query)
             print(msg)
 
-            query = input(
+            query = self.input(
                 Presenter.info("Enter a search string (or press Enter to continue): ")
             ).strip()
             if not query:
@@ -664,33 +855,29 @@ class CommandHandler:
             return "No notes to edit. Edit cancelled."
 
         while True:
-            user_input = input(
+            user_input = self.input(
                 Presenter.info(
-                    f"Enter the number of the note to edit 1-{len(notes)} (or press Enter to exit): "
+                    f"Enter the number of the note to edit 1-{len(notes)} "
+                    "or its #id (or press Enter to exit): "
                 )
             ).strip()
 
             if not user_input:
                 return "Edit cancelled."
 
-            try:
-                index = int(user_input)
-                if not 1 <= index <= len(notes):
-                    print(Presenter.warning("Invalid number. Try again."))
-                    continue
-            except ValueError:
-                print(Presenter.warning("Please enter a valid number."))
-                continue
+            note_to_edit = self._pick_note(notes, user_input)
+            if note_to_edit is not None:
+                break
 
-            note_to_edit = notes[index - 1]
-            break
+        return self._edit_note(note_to_edit)
 
+    def _edit_note(self, note_to_edit):
         print(self.repository.format_notes(note_to_edit, " Editing..."))
-        new_text = input(
+        new_text = self.input(
             Presenter.info("Enter a new note text (or press Enter to continue): ")
         ).strip()
 
-        tags = input(
+        tags = self.input(
             Presenter.info(
                 "Enter new tags separated by commas (or press Enter to continue): "
             )
@@ -700,6 +887,32 @@ class CommandHandler:
 
         return self.repository.edit_note(note_to_edit, new_text, tags)
 
+    @staticmethod
+    def _note_id(reference):
+        """Id of a note addressed as #<id>, or None for any other input"""
+        if reference and reference.startswith("#") and reference[1:].isdigit():
+            return int(reference[1:])
+        return None
+
+    def _pick_note(self, notes, user_input):
+        """Note chosen by its number in notes or by #id; None after a warning"""
+        note_id = self._note_id(user_input)
+        if note_id is not None:
+            note = self.repository.get_note(note_id)
+            if note is None:
+                print(Presenter.warning(f"Note #{note_id} not found. Try again."))
+            return note
+
+        try:
+            index = int(user_input)
+        except ValueError:
+            print(Presenter.warning("Please enter a valid number."))
+            return None
+        if not 1 <= index <= len(notes):
+            print(Presenter.warning("Invalid number. Try again."))
+            return None
+        return notes[index - 1]
+
     @input_error
     def tag(self):
         return self.repository.notes_by_tags()
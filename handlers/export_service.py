@@ -0,0 +1,227 @@
+"""Export service: stream contacts or notes to CSV, JSON Lines or vCard files."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from handlers.birthday_service import BirthdayService
+from models.contact import Record
+from models.note import Note
+
+# Rows formatted in memory before each write to the file
+CHUNK_SIZE = 1000
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".vcf": "vcard", ".vcard": "vcard"}
+# Joins several phones or emails in one CSV cell, as read back by import
+MULTI_VALUE_SEPARATOR = ";"
+CONTACT_COLUMNS = ["name", "phones", "emails", "address", "birthday"]
+NOTE_COLUMNS = ["id", "text", "tags"]
+
+
+@dataclass
+class ExportReport:
+    """Outcome of one export."""
+
+    path: Path
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput over the whole export."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class ExportService:
+    """Write contacts or notes to a file without collecting them first.
+
+    Contacts come from ContactRepository.iter_contacts, iter_search_contacts
+    (a search-contacts query) or the birthday window of BirthdayService;
+    notes from iter_notes, optionally filtered like note-list. Rows are
+    formatted CHUNK_SIZE at a time and each chunk is written with one call.
+    """
+
+    def __init__(self, repository) -> None:
+        """Initialize with a contact repository."""
+        self._repository = repository
+
+    def contacts(
+        self, query: str | None = None, birthday_days: int | None = None
+    ) -> Iterator[Record]:
+        """Contacts matching query, or with a birthday within birthday_days."""
+        if query and birthday_days is not None:
+            raise ValueError("Export either a search or a birthday window, not both.")
+        if query:
+            return self._repository.iter_search_contacts(query)
+        if birthday_days is not None:
+            return self._birthday_contacts(birthday_days)
+        return self._repository.iter_contacts()
+
+    def notes(self, query: str | None = None) -> Iterator[Note]:
+        """Notes whose text or tags contain query, or all notes."""
+        return self._repository.iter_notes(query or "")
+
+    def export_contacts(
+        self,
+        path: str | Path,
+        file_format: str | None = None,
+        query: str | None = None,
+        birthday_days: int | None = None,
+    ) -> ExportReport:
+        """Write the contacts selected as in contacts() to path."""
+        path, file_format = _resolve(path, file_format)
+        writer = CONTACT_WRITERS[file_format]
+        return _export(path, writer, self.contacts(query, birthday_days))
+
+    def export_notes(
+        self,
+        path: str | Path,
+        file_format: str | None = None,
+        query: str | None = None,
+    ) -> ExportReport:
+        """Write the notes selected as in notes() to path."""
+        path, file_format = _resolve(path, file_format)
+        if file_format not in NOTE_WRITERS:
+            raise ValueError("Notes can be exported to csv or jsonl only.")
+        return _export(path, NOTE_WRITERS[file_format], self.notes(query))
+
+    def _birthday_contacts(self, days: int) -> Iterator[Record]:
+        # Rows come in congratulation order, one lookup per contact
+        for row in BirthdayService(self._repository).iter_near(days):
+            record = self._repository.find_contact(row["name"])
+            if record is not None:
+                yield record
+
+
+def _resolve(path: str | Path, file_format: str | None) -> tuple[Path, str]:
+    path = Path(path)
+    file_format = file_format or FORMATS.get(path.suffix.lower())
+    if file_format not in ("csv", "jsonl", "vcard"):
+        raise ValueError(
+            f"Unknown export format for {path.name}. "
+            "Use --format csv, jsonl or vcard."
+        )
+    return path, file_format
+
+
+def _export(path: Path, writer: Callable, items: Iterable) -> ExportReport:
+    report = ExportReport(path)
+    started = time.perf_counter()
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        report.rows = writer(items, f)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _write_chunked(items: Iterable, f, header: str, format_item: Callable) -> int:
+    """Write header and format_item(item) of every item, CHUNK_SIZE per write."""
+    f.write(header)
+    count = 0
+    chunk = []
+    for item in items:
+        chunk.append(format_item(item))
+        if len(chunk) == CHUNK_SIZE:
+            f.write("".join(chunk))
+            count += len(chunk)
+            chunk = []
+    f.write("".join(chunk))
+    return count + len(chunk)
+
+
+def _csv_formatter(columns: list[str], values: Callable) -> tuple[str, Callable]:
+    """(header line, item -> CSV line) for items turned into rows by values."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(row) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    return line(columns), lambda item: line(values(item))
+
+
+def _contact_row(record: Record) -> list:
+    return [
+        record.name.value,
+        MULTI_VALUE_SEPARATOR.join(p.value for p in record.phones),
+        MULTI_VALUE_SEPARATOR.join(e.value for e in record.emails),
+        record.address.value if record.address else "",
+        str(record.birthday) if record.birthday else "",
+    ]
+
+
+def write_contacts_csv(records: Iterable[Record], f) -> int:
+    """CSV with the columns import reads back; returns the number of rows."""
+    header, format_row = _csv_formatter(CONTACT_COLUMNS, _contact_row)
+    return _write_chunked(records, f, header, format_row)
+
+
+def write_contacts_jsonl(records: Iterable[Record], f) -> int:
+    """One Record.to_dict object per line; returns the number of rows."""
+    return _write_chunked(records, f, "", lambda record: _json_line(record.to_dict()))
+
+
+def write_contacts_vcard(records: Iterable[Record], f) -> int:
+    """vCard 3.0 cards with FN, N, TEL, EMAIL, ADR and BDAY."""
+    return _write_chunked(records, f, "", _vcard)
+
+
+def _json_line(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+def _vcard(record: Record) -> str:
+    name = _escape(record.name.value)
+    lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{name}", f"N:;{name};;;"]
+    lines.extend(f"TEL;TYPE=CELL:{p.value}" for p in record.phones)
+    lines.extend(f"EMAIL;TYPE=INTERNET:{e.value}" for e in record.emails)
+    if record.address:
+        # The whole address goes to the street component
+        lines.append(f"ADR;TYPE=HOME:;;{_escape(record.address.value)};;;;")
+    if record.birthday:
+        birth_date = record.birthday.value
+        if isinstance(birth_date, datetime):
+            birth_date = birth_date.date()
+        lines.append(f"BDAY:{birth_date.isoformat()}")
+    lines.append("END:VCARD")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+    )
+
+
+def _note_row(note: Note) -> list:
+    return [note.id, note.text, ", ".join(note.tags)]
+
+
+def write_notes_csv(notes: Iterable[Note], f) -> int:
+    """CSV of note id, text and comma-separated tags."""
+    header, format_row = _csv_formatter(NOTE_COLUMNS, _note_row)
+    return _write_chunked(notes, f, header, format_row)
+
+
+def write_notes_jsonl(notes: Iterable[Note], f) -> int:
+    """One Note.to_dict object per line."""
+    return _write_chunked(notes, f, "", lambda note: _json_line(note.to_dict()))
+
+
+CONTACT_WRITERS = {
+    "csv": write_contacts_csv,
+    "jsonl": write_contacts_jsonl,
+    "vcard": write_contacts_vcard,
+}
+NOTE_WRITERS = {"csv": write_notes_csv, "jsonl": write_notes_jsonl}
@@ -0,0 +1,408 @@
+"""Import service: bulk-load contacts from CSV or vCard files."""
+
+from __future__ import annotations
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from handlers.errors import ValidationError
+from models.address import Address
+from models.birthday import Birthday
+from models.contact import Record
+from models.email import Email
+from models.phone import Phone
+from search.field_index import email_key, phone_key
+
+# Rows validated per task sent to a worker process
+CHUNK_SIZE = 2000
+# Chunks queued per worker, so reading stays only a little ahead of validation
+CHUNKS_PER_WORKER = 2
+# Separators of several phones or emails in one CSV cell
+MULTI_VALUE_SEPARATORS = str.maketrans({",": ";", "|": ";"})
+CSV_COLUMNS = {
+    "name": "name",
+    "full name": "name",
+    "phone": "phones",
+    "phones": "phones",
+    "email": "emails",
+    "emails": "emails",
+    "address": "address",
+    "birthday": "birthday",
+}
+VCARD_LISTS = {"TEL": "phones", "EMAIL": "emails"}
+FORMATS = {".csv": "csv", ".vcf": "vcard", ".vcard": "vcard"}
+
+
+@dataclass
+class ImportReport:
+    """Outcome of one import."""
+
+    rows: int = 0
+    # Rows that created a contact and rows merged into an existing one
+    added: int = 0
+    merged: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    rejects_path: Path | None = None
+    reasons: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput over the whole import."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class ImportService:
+    """Stream contacts from a file, validate them in parallel, merge in bulk.
+
+    Rows are read lazily and validated in chunks by a process pool. Valid
+    rows are merged chunk by chunk: a new name becomes a contact, a known
+    name gets the new phones and emails added and its address and birthday
+    replaced when the row has them. Rows failing validation or claiming a
+    phone or email of another contact are written to a CSV reject report
+    with their row number.
+    """
+
+    def __init__(self, repository, workers: int | None = None) -> None:
+        """workers is the process count; 0 validates in this process."""
+        self._repository = repository
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+
+    def import_file(
+        self,
+        path: str | Path,
+        file_format: str | None = None,
+        rejects_path: str | Path | None = None,
+    ) -> ImportReport:
+        """Import path; file_format defaults to the one of its extension."""
+        path = Path(path)
+        file_format = file_format or FORMATS.get(path.suffix.lower())
+        if file_format not in ("csv", "vcard"):
+            raise ValueError(
+                f"Unknown import format for {path.name}. Use --format csv or vcard."
+            )
+        rejects_path = Path(rejects_path or path.with_suffix(".rejects.csv"))
+        rows = read_csv(path) if file_format == "csv" else read_vcard(path)
+
+        report = ImportReport()
+        started = time.perf_counter()
+        with RejectWriter(rejects_path) as rejects:
+            for results in self._validated_chunks(rows):
+                report.rows += len(results)
+                self._merge(results, report, rejects)
+        report.seconds = time.perf_counter() - started
+        if report.rejected:
+            report.rejects_path = rejects_path
+        return report
+
+    def _validated_chunks(self, rows) -> Iterator[list]:
+        chunks = _chunked(rows, CHUNK_SIZE)
+        if self._workers <= 0:
+            yield from map(validate_rows, chunks)
+            return
+
+        first = next(chunks, None)
+        if first is None:
+            return
+        if len(first) < CHUNK_SIZE:
+            # A single chunk: starting processes would cost more than it saves
+            yield validate_rows(first)
+            return
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            pending = deque([executor.submit(validate_rows, first)])
+            for chunk in chunks:
+                pending.append(executor.submit(validate_rows, chunk))
+                if len(pending) >= self._workers * CHUNKS_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _merge(self, results: list, report: ImportReport, rejects) -> None:
+        """Merge one validated chunk into the repository with one bulk call.
+
+        Known contacts are merged on copies: the stored records only change
+        when add_contacts swaps the copies in under the repository lock.
+        """
+        repository = self._repository
+        records = {}
+        # Phones and emails given to contacts of this chunk, not indexed yet
+        claimed = {"phone": {}, "email": {}}
+
+        for number, name, values, error in results:
+            if error is None:
+                error = self._conflict(name, values, claimed)
+            if error is not None:
+                report.rejected += 1
+                reason = error.split(":", 1)[0]
+                report.reasons[reason] = report.reasons.get(reason, 0) + 1
+                rejects.write(number, name, error)
+                continue
+
+            record = records.get(name)
+            if record is None:
+                # Exact names only: "john" in a file is not merged into "John"
+                stored = repository.contacts.get(name)
+                if stored is None or stored.name.value != name:
+                    record = Record(name)
+                    report.added += 1
+                else:
+                    # The stored record changes only through add_contacts below
+                    record = _copied(stored)
+                    report.merged += 1
+                records[name] = record
+            else:
+                report.merged += 1
+            _merge_values(record, values)
+            for phone in values[0]:
+                claimed["phone"][phone_key(phone)] = name
+            for email in values[1]:
+                claimed["email"][email_key(email)] = name
+
+        repository.add_contacts(records.values())
+
+    def _conflict(self, name: str, values: tuple, claimed: dict) -> str | None:
+        """Why values can't go to name, or None if they can."""
+        checks = (
+            ("phone", values[0], phone_key, self._repository.find_by_phone),
+            ("email", values[1], email_key, self._repository.find_by_email),
+        )
+        for kind, field_values, key, find in checks:
+            for value in field_values:
+                owner = claimed[kind].get(key(value))
+                if owner is None:
+                    owners = (c.name.value for c in find(value))
+                    owner = next((o for o in owners if o != name), None)
+                if owner is not None and owner != name:
+                    return f"duplicate {kind}: {value} already belongs to {owner}"
+        return None
+
+
+class RejectWriter:
+    """CSV reject report (row, name, reason), created on the first reject."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._file = None
+        self._writer = None
+
+    def __enter__(self) -> RejectWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def write(self, number: int, name: str, reason: str) -> None:
+        if self._writer is None:
+            self._file = open(self._path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["row", "name", "reason"])
+        self._writer.writerow([number, name, reason])
+
+
+def validate_rows(rows: list) -> list:
+    """Validate (row number, fields) pairs; runs in the worker processes.
+
+    Returns (row number, name, values, error) per row, where values is
+    (phones, emails, address, birthday ordinal) as the models store them
+    and error is None for a valid row.
+    """
+    results = []
+    for number, row in rows:
+        name = (row.get("name") or "").strip()
+        try:
+            results.append((number, name, _validated_values(name, row), None))
+        except (ValidationError, ValueError) as e:
+            results.append((number, name, None, _reason(e)))
+    return results
+
+
+def _validated_values(name: str, row: dict) -> tuple:
+    if not name:
+        raise ValidationError("name", "Name is required")
+    record = Record(name)
+    for phone in row.get("phones", ()):
+        record.add_phone(phone)
+    for email in row.get("emails", ()):
+        record.add_email(email)
+    if row.get("address"):
+        record.set_address(row["address"])
+    if row.get("birthday"):
+        try:
+            record.set_birthday(row["birthday"])
+        except ValueError as e:
+            raise ValidationError("birthday", str(e)) from None
+    return (
+        [p.value for p in record.phones],
+        [e.value for e in record.emails],
+        record.address.value if record.address else None,
+        record.birthday.value.toordinal() if record.birthday else 0,
+    )
+
+
+def _reason(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return f"invalid {error.field}: {error.message}"
+    return f"invalid row: {error}"
+
+
+def _copied(record: Record) -> Record:
+    """A record with the fields of record, in lists of its own."""
+    copy = Record(record.name.value)
+    copy.phones = list(record.phones)
+    copy.emails = list(record.emails)
+    copy.address = record.address
+    copy.birthday = record.birthday
+    return copy
+
+
+def _merge_values(record: Record, values: tuple) -> None:
+    """Add new phones and emails to record; replace address and birthday."""
+    phones, emails, address, birthday = values
+    if record.phones or record.emails:
+        known_phones = {phone_key(p.value) for p in record.phones}
+        phones = [p for p in phones if phone_key(p) not in known_phones]
+        known_emails = {email_key(e.value) for e in record.emails}
+        emails = [e for e in emails if email_key(e) not in known_emails]
+    record.phones.extend(Phone.restore(phone) for phone in dict.fromkeys(phones))
+    record.emails.extend(Email.restore(email) for email in dict.fromkeys(emails))
+    if address is not None:
+        record.address = Address.restore(address)
+    if birthday:
+        record.birthday = Birthday.restore(datetime.fromordinal(birthday))
+
+
+def _chunked(rows, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _split_values(cell: str | None) -> list:
+    if not cell:
+        return []
+    values = cell.translate(MULTI_VALUE_SEPARATORS).split(";")
+    return [value.strip() for value in values if value.strip()]
+
+
+def read_csv(path: Path) -> Iterator[tuple[int, dict]]:
+    """Yield (line number, fields) of every data row of a CSV file.
+
+    The header names the columns (name, phones, emails, address, birthday;
+    singular forms are accepted). Several phones or emails in a cell are
+    separated by ";", "," or "|". Birthdays are DD.MM.YYYY.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [CSV_COLUMNS.get(title.strip().lower()) for title in header]
+        if "name" not in columns:
+            raise ValueError(f"{path.name} has no name column")
+
+        for cells in reader:
+            if not any(cell.strip() for cell in cells):
+                continue
+            row = {}
+            for column, cell in zip(columns, cells):
+                if column in ("phones", "emails"):
+                    row.setdefault(column, []).extend(_split_values(cell))
+                elif column is not None:
+                    row[column] = cell.strip()
+            yield reader.line_num, row
+
+
+def read_vcard(path: Path) -> Iterator[tuple[int, dict]]:
+    """Yield (line number of BEGIN:VCARD, fields) of every card of a vCard file.
+
+    FN, TEL, EMAIL, ADR and BDAY are read; folded lines are unfolded and
+    BDAY in YYYY-MM-DD or YYYYMMDD form becomes DD.MM.YYYY.
+    """
+    card = None
+    start = 0
+    for number, line in _unfolded_lines(path):
+        name, _, value = line.partition(":")
+        # Drop parameters (TEL;TYPE=CELL) and groups (item1.EMAIL)
+        key = name.split(";", 1)[0].rsplit(".", 1)[-1].upper()
+        if key == "BEGIN" and value.strip().upper() == "VCARD":
+            card, start = {"phones": [], "emails": []}, number
+        elif card is None:
+            continue
+        elif key == "END":
+            yield start, card
+            card = None
+        elif key in ("TEL", "EMAIL"):
+            card[VCARD_LISTS[key]].append(_unescape(value).strip())
+        elif key == "FN":
+            card["name"] = _unescape(value).strip()
+        elif key == "ADR":
+            parts = (_unescape(part).strip() for part in _split_escaped(value))
+            card["address"] = ", ".join(part for part in parts if part)
+        elif key == "BDAY":
+            card["birthday"] = _vcard_date(value.strip())
+
+
+def _unfolded_lines(path: Path) -> Iterator[tuple[int, str]]:
+    current, start = None, 0
+    with open(path, encoding="utf-8-sig") as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if line[:1] in (" ", "\t") and current is not None:
+                current += line[1:]
+                continue
+            if current is not None:
+                yield start, current
+            current, start = line, number
+    if current is not None:
+        yield start, current
+
+
+def _split_escaped(value: str) -> list:
+    parts, current, escaped = [], [], False
+    for char in value:
+        if escaped:
+            current.append("\\" + char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ";":
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _unescape(value: str) -> str:
+    return (
+        value.replace("\\n", " ")
+        .replace("\\N", " ")
+        .replace("\\,", ",")
+        .replace("\\;", ";")
+        .replace("\\\\", "\\")
+    )
+
+
+def _vcard_date(value: str) -> str:
+    for date_format in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(value[:10], date_format).strftime("%d.%m.%Y")
+        except ValueError:
+            continue
+    # Left as is: Birthday rejects it with its usual message
+    return value
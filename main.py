@@ -1,27 +1,62 @@
+import argparse
 import sys
 
+from cli.batch_runner import BatchRunner
 from cli.command_suggester import CommandSuggester
 from cli.presenter import Presenter
 from cli.prompt_manager import PromptManager
 from handlers.command_handler import CommandHandler
 from repositories.contact_repository import ContactRepository
+from storage.autosave import AutosaveWorker
 from storage.factory import StorageFactory
 from utils.utils import parse_user_input_data
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Address book assistant bot")
+    parser.add_argument("storage", nargs="?", default="pkl", help="storage format")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help="run the commands of FILE ('-' for stdin) without prompts",
+    )
+    parser.add_argument(
+        "--save-every",
+        metavar="N",
+        type=int,
+        help="in batch mode, also save after every N commands",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
-    # Initialize repositories and handlers
-    storage_type = sys.argv[1] if len(sys.argv) > 1 else "pkl"
+    args = parse_args()
 
+    # Initialize repositories and handlers
     try:
-        storage = StorageFactory.create_storage(storage_type)
+        storage = StorageFactory.create_storage(args.storage)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
-    repository = storage.load()
+    repository = storage.load_latest_valid()
     if not isinstance(repository, ContactRepository):
         repository = ContactRepository()
+    storage.attach(repository)
+
+    if args.batch is not None:
+        runner = BatchRunner(storage, repository, args.save_every)
+        with args.batch:
+            succeeded = runner.run(args.batch)
+        runner.report()
+        sys.exit(0 if succeeded else 1)
+
+    # Snapshot-based storages are saved periodically instead of only on exit
+    autosave = None
+    if not storage.writes_through:
+        autosave = AutosaveWorker(storage, repository)
+        autosave.start()
 
     command_handler = CommandHandler(repository)
     command_suggester = CommandSuggester()
@@ -42,7 +77,8 @@ def main():
                         print("Good bye User!")
                         break
                     if command_handler[command]:
-                        print(command_handler[command](*args))
+                        result = command_handler[command](*args)
+                        print(result)
                     else:
                         print(command_suggester.get_suggestion_message(command))
                 else:
@@ -60,7 +96,11 @@ def main():
                 # Handle unexpected errors
                 print(Presenter.error(f"Unexpected error: {str(e)}"))
     finally:
-        storage.save(repository)
+        if autosave is not None:
+            autosave.stop()
+            autosave.save_if_dirty()
+        else:
+            storage.save(repository)
 
 
 if __name__ == "__main__":
@@ -2,5 +2,7 @@ from models.field import Field
 
 
 class Address(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__(value)
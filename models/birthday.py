@@ -1,14 +1,13 @@
 from models.field import Field
-from datetime import datetime
+from utils.validators import BIRTHDAY_FORMAT, parse_birthday
 
 
 class Birthday(Field):
+    __slots__ = ()
+
     # DD.MM.YYYY format
     def __init__(self, value):
-        try:
-            self.value = datetime.strptime(value, "%d.%m.%Y")
-        except ValueError:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY")
+        self.value = parse_birthday(value)
 
     def __str__(self):
-        return self.value.strftime("%d.%m.%Y")
+        return self.value.strftime(BIRTHDAY_FORMAT)
@@ -3,9 +3,13 @@ from models.phone import Phone
 from models.birthday import Birthday
 from models.email import Email
 from models.address import Address
+from utils.validators import parse_birthday
 
 
 class Record:
+    # Slots instead of a per-instance __dict__; __weakref__ for record caches
+    __slots__ = ("name", "phones", "emails", "address", "birthday", "__weakref__")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
@@ -63,6 +67,60 @@ class Record:
         else:
             raise ValueError(f"Email {old_email} not found.")
 
+    def __getstate__(self):
+        # Same shape as the __dict__ records had before __slots__, for pickle/JSON
+        return {
+            "name": self.name,
+            "phones": self.phones,
+            "emails": self.emails,
+            "address": self.address,
+            "birthday": self.birthday,
+        }
+
+    def __setstate__(self, state):
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+
+    def to_dict(self):
+        return {
+            "name": self.name.value,
+            "phones": [p.value for p in self.phones],
+            "emails": [e.value for e in self.emails],
+            "address": self.address.value if self.address else None,
+            "birthday": str(self.birthday) if self.birthday else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data, trusted=False):
+        """Rebuild a record from the output of to_dict.
+
+        trusted skips validation; storages pass it for data they wrote
+        themselves, which only ever holds values that were validated.
+        """
+        if trusted:
+            return cls._restore(data)
+        record = cls(data["name"])
+        for phone in data.get("phones", []):
+            record.add_phone(phone)
+        for email in data.get("emails", []):
+            record.add_email(email)
+        if data.get("address"):
+            record.set_address(data["address"])
+        if data.get("birthday"):
+            record.set_birthday(data["birthday"])
+        return record
+
+    @classmethod
+    def _restore(cls, data):
+        record = cls(data["name"])
+        record.phones = [Phone.restore(phone) for phone in data.get("phones", [])]
+        record.emails = [Email.restore(email) for email in data.get("emails", [])]
+        if data.get("address"):
+            record.address = Address.restore(data["address"])
+        if data.get("birthday"):
+            record.birthday = Birthday.restore(parse_birthday(data["birthday"]))
+        return record
+
     def __str__(self):
         result = f"Contact name: {self.name.value}"
         if self.phones:
@@ -1,10 +1,27 @@
 class Field:
+    # No per-instance __dict__: a book holds several fields per contact
+    __slots__ = ("_value",)
+
     def __init__(self, value):
         self.value = value
 
     def __str__(self):
         return str(self.value)
 
+    def __getstate__(self):
+        # Same shape as the __dict__ fields had before __slots__, for pickle/JSON
+        return {"_value": self._value}
+
+    def __setstate__(self, state):
+        self._value = state["_value"]
+
+    @classmethod
+    def restore(cls, value):
+        """Rebuild a field from an already validated stored value"""
+        field = cls.__new__(cls)
+        field._value = value
+        return field
+
     @property
     def value(self):
         return self._value
@@ -1,6 +1,11 @@
 class Note:
-    def __init__(self, text, tags=None):
+    # id is assigned by ContactRepository when the note is stored;
+    # __weakref__ for note caches
+    __slots__ = ("text", "tags", "id", "__weakref__")
+
+    def __init__(self, text, tags=None, note_id=None):
         self.text = text
+        self.id = note_id
 
         if tags is None:
             self.tags = []
@@ -12,8 +17,24 @@ class Note:
         # Опціонально — привести теги до нижнього регістру
         # self.tags = [t.lower() for t in self.tags]
 
+    def __getstate__(self):
+        return {"text": self.text, "id": self.id, "tags": self.tags}
+
+    def __setstate__(self, state):
+        self.text = state["text"]
+        self.tags = state["tags"]
+        # Notes pickled before ids existed have none yet
+        self.id = state.get("id")
+
     def to_dict(self):
-        return {"text": self.text, "tags": self.tags}
+        data = {"text": self.text, "tags": self.tags}
+        if self.id is not None:
+            data["id"] = self.id
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["text"], data.get("tags"), data.get("id"))
 
     def __str__(self):
         if self.tags:
@@ -1,72 +1,380 @@
+import copy
+import threading
 from collections import defaultdict
+from itertools import islice
 
 from models.contact import Record
 from models.note import Note
-
+from handlers.errors import ValidationError
+
+from search.birthday_columns import HAS_NUMPY, BirthdayColumns
+from search.birthday_index import BirthdayIndex
+from search.field_index import FieldIndex, email_key, phone_key
+from search.name_index import NameIndex
+from search.note_index import NoteIndex
+from search.search_index import SearchIndex
 from search.search_service import SearchService
 from cli.presenter import Presenter
 
+# add_contacts re-sorts the name index once a batch is 1/8 of the book or more
+NAME_INDEX_REBUILD_RATIO = 8
+
 
 class ContactRepository:
+    # Session-only attributes that are never written to storage
+    TRANSIENT_ATTRIBUTES = (
+        "_search_index",
+        "_birthday_index",
+        "_birthday_columns",
+        "_phone_index",
+        "_email_index",
+        "_name_index",
+        "_note_index",
+        "_listeners",
+        "lock",
+        "generation",
+    )
+
     def __init__(self):
         self.contacts = {}
         self.search_service = SearchService()
-        self.notes = []
+        # Notes by id, in the order they were added
+        self._notes = {}
+        self.next_note_id = 1
+        # Derived indexes: built on first use, then maintained incrementally
+        self._search_index = None
+        self._birthday_index = None
+        self._birthday_columns = None
+        self._phone_index = None
+        self._email_index = None
+        self._name_index = None
+        self._note_index = None
+        # Callbacks receiving every mutation, e.g. a write-ahead log
+        self._listeners = []
+        # Held by every mutation, so snapshots never see a half-applied one
+        self.lock = threading.RLock()
+        # Incremented on every mutation; unchanged generation means nothing to save
+        self.generation = 0
+
+    def __getstate__(self):
+        # Indexes are rebuilt on demand, so keep them out of saved files
+        state = self.__dict__.copy()
+        for name in self.TRANSIENT_ATTRIBUTES:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        # Files saved by older versions lack newer attributes: start from defaults
+        self.__init__()
+        notes = state.pop("notes", None)
+        self.__dict__.update(state)
+        if notes is not None:
+            # Saved before notes had ids: number them in list order
+            self.notes = notes
+
+    @property
+    def notes(self) -> list:
+        """All notes in the order they were added"""
+        return list(self._notes.values())
+
+    @notes.setter
+    def notes(self, notes):
+        self._notes = {}
+        self._note_index = None
+        for note in notes:
+            self._store_note(note)
+
+    def get_note(self, note_id: int):
+        """Note with the given id, or None"""
+        return self._notes.get(note_id)
+
+    @property
+    def search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            for name, document in self._contact_documents():
+                self._search_index.add(name, document)
+        return self._search_index
+
+    @property
+    def birthday_index(self) -> BirthdayIndex:
+        if self._birthday_index is None:
+            self._birthday_index = BirthdayIndex()
+            for name, birthday in self._contact_birthdays():
+                self._birthday_index.add(name, birthday)
+        return self._birthday_index
+
+    @property
+    def birthday_columns(self):
+        """BirthdayColumns of the contacts, or None when numpy isn't installed"""
+        if self._birthday_columns is None and HAS_NUMPY:
+            self._birthday_columns = BirthdayColumns()
+            for name, birthday in self._contact_birthdays():
+                self._birthday_columns.add(name, birthday)
+        return self._birthday_columns
+
+    @property
+    def name_index(self) -> NameIndex:
+        if self._name_index is None:
+            self._name_index = NameIndex(self.contacts)
+        return self._name_index
+
+    @property
+    def note_index(self) -> NoteIndex:
+        if self._note_index is None:
+            self._note_index = NoteIndex(self.notes)
+        return self._note_index
+
+    @property
+    def phone_index(self) -> FieldIndex:
+        if self._phone_index is None:
+            self._phone_index = FieldIndex(phone_key)
+            for name, phones in self._contact_phones():
+                self._phone_index.add(name, phones)
+        return self._phone_index
+
+    @property
+    def email_index(self) -> FieldIndex:
+        if self._email_index is None:
+            self._email_index = FieldIndex(email_key)
+            for name, emails in self._contact_emails():
+                self._email_index.add(name, emails)
+        return self._email_index
+
+    # Full scans feeding the indexes; subclasses with another layout override them
+    def _contact_documents(self):
+        """(name, search document) of every contact"""
+        for name, record in self.contacts.items():
+            yield name, self.search_service.build_document(record)
+
+    def _contact_birthdays(self):
+        """(name, birthday datetime) of every contact that has a birthday"""
+        for name, record in self.contacts.items():
+            if record.birthday:
+                yield name, record.birthday.value
+
+    def _contact_phones(self):
+        """(name, phone values) of every contact"""
+        for name, record in self.contacts.items():
+            yield name, (p.value for p in record.phones)
+
+    def _contact_emails(self):
+        """(name, email values) of every contact"""
+        for name, record in self.contacts.items():
+            yield name, (e.value for e in record.emails)
+
+    def subscribe(self, listener):
+        """Call listener(event, *payload) after every mutation.
+
+        Events: ("put_contact", record), ("put_contacts", records) for a
+        whole add_contacts batch, ("delete_contact", name),
+        ("add_note", note), ("edit_note", note_id, note),
+        ("delete_note", note_id).
+        """
+        self._listeners.append(listener)
+
+    def snapshot(self) -> "ContactRepository":
+        """Copy-on-write view of the stored data, safe to save from another thread.
+
+        Only the contact and note containers are copied under the lock; the
+        records and notes themselves are shared, so the storage serializes
+        the book once, outside the lock. A contact edited while a save runs
+        may be written with the edit, and the next save covers it anyway.
+        """
+        with self.lock:
+            view = copy.copy(self)
+            view.contacts = self.contacts.copy()
+            view._notes = self._notes.copy()
+        return view
+
+    def _notify(self, event: str, *payload):
+        self.generation += 1
+        for listener in self._listeners:
+            listener(event, *payload)
 
     def add_contact(self, record: Record):
         """Add a new contact or update existing one"""
-        self.contacts[record.name.value] = record
+        with self.lock:
+            self.contacts[record.name.value] = record
+            self._index_contact(record)
+            self._notify("put_contact", record)
+
+    def add_contacts(self, records):
+        """Add or update many contacts at once.
+
+        Indexes are updated record by record, except the sorted name index:
+        each insertion shifts the whole list, so once the batch is a sizeable
+        part of the book it is dropped and sorted again on next use.
+        Listeners get one put_contacts event for the whole batch.
+        """
+        records = list(records)
+        with self.lock:
+            if len(records) * NAME_INDEX_REBUILD_RATIO >= len(self.contacts):
+                self._name_index = None
+            for record in records:
+                self.contacts[record.name.value] = record
+                self._index_contact(record)
+            self._notify("put_contacts", records)
+
+    def update_contact(self, record: Record):
+        """Refresh indexes after the fields of a stored contact were edited"""
+        with self.lock:
+            self._index_contact(record)
+            self._notify("put_contact", record)
 
     def find_contact(self, name: str) -> Record:
-        """Find a contact by name"""
-        return self.contacts.get(name)
+        """Find a contact by name, ignoring case when that is unambiguous"""
+        record = self.contacts.get(name)
+        if record is None:
+            matches = self.name_index.find(name)
+            if len(matches) == 1:
+                record = self.contacts.get(matches[0])
+        return record
+
+    def names_with_prefix(self, prefix: str, limit: int = None) -> list:
+        """Up to limit contact names starting with prefix ignoring case, sorted"""
+        return self.name_index.prefix(prefix, limit)
 
     def delete_contact(self, name: str):
         """Delete a contact by name"""
-        if name in self.contacts:
-            del self.contacts[name]
-            return True
-        return False
+        with self.lock:
+            if name in self.contacts:
+                del self.contacts[name]
+                self._unindex_contact(name)
+                self._notify("delete_contact", name)
+                return True
+            return False
 
     def get_all_contacts(self):
         """Get all contacts"""
         return list(self.contacts.values())
 
+    def iter_contacts(self, offset: int = 0, limit: int = None):
+        """Yield contacts in insertion order from offset, at most limit of them"""
+        stop = None if limit is None else offset + limit
+        contacts = self.contacts
+        for name in islice(contacts, offset, stop):
+            yield contacts[name]
+
+    def count_contacts(self) -> int:
+        return len(self.contacts)
+
     def has_contact(self, name: str) -> bool:
         """Check if contact exists"""
         return name in self.contacts
 
+    def find_by_phone(self, phone: str) -> list:
+        """Contacts having phone, compared in its normalize_phone form"""
+        return [self.contacts[name] for name in self.phone_index.owners(phone)]
+
+    def find_by_email(self, email: str) -> list:
+        """Contacts having email, compared case-insensitively"""
+        return [self.contacts[name] for name in self.email_index.owners(email)]
+
+    def ensure_unique_phone(self, phone: str, name: str = None):
+        """Raise ValidationError if a contact other than name already has phone"""
+        for owner in self.find_by_phone(phone):
+            if owner.name.value != name:
+                raise ValidationError(
+                    "phone", f"Phone {phone} already belongs to {owner.name.value}"
+                )
+
+    def ensure_unique_email(self, email: str, name: str = None):
+        """Raise ValidationError if a contact other than name already has email"""
+        for owner in self.find_by_email(email):
+            if owner.name.value != name:
+                raise ValidationError(
+                    "email", f"Email {email} already belongs to {owner.name.value}"
+                )
+
     def search_contacts(self, query: str):
-        return self.search_service.exact_search(self.contacts, query)
+        return self.search_service.exact_search(
+            self.contacts, query, self.search_index
+        )
+
+    def iter_search_contacts(self, query: str):
+        """Yield the contacts of search_contacts one by one"""
+        contacts = self.contacts
+        for name in self.search_index.search(query):
+            yield contacts[name]
+
+    def search_contacts_page(self, query: str, offset: int, limit: int) -> tuple:
+        """(count of search_contacts matches, the limit of them from offset)
+
+        Both come from one search of the index.
+        """
+        names = self.search_index.search(query)
+        contacts = self.contacts
+        return len(names), [contacts[name] for name in names[offset : offset + limit]]
 
     def search_closest_contacts(self, query: str):
-        return self.search_service.fuzzy_search(self.contacts, query)
+        return self.search_service.fuzzy_search(
+            self.contacts, query, index=self.search_index
+        )
+
+    def _index_contact(self, record: Record):
+        if self._name_index is not None:
+            self._name_index.add(record.name.value)
+        if self._search_index is not None:
+            self._search_index.add(
+                record.name.value, self.search_service.build_document(record)
+            )
+        if self._phone_index is not None:
+            self._phone_index.add(record.name.value, (p.value for p in record.phones))
+        if self._email_index is not None:
+            self._email_index.add(record.name.value, (e.value for e in record.emails))
+        for birthdays in (self._birthday_index, self._birthday_columns):
+            if birthdays is None:
+                continue
+            if record.birthday:
+                birthdays.add(record.name.value, record.birthday.value)
+            else:
+                birthdays.remove(record.name.value)
+
+    def _unindex_contact(self, name: str):
+        if self._name_index is not None:
+            self._name_index.remove(name)
+        if self._search_index is not None:
+            self._search_index.remove(name)
+        if self._birthday_index is not None:
+            self._birthday_index.remove(name)
+        if self._birthday_columns is not None:
+            self._birthday_columns.remove(name)
+        for fields in (self._phone_index, self._email_index):
+            if fields is not None:
+                fields.remove(name)
 
     # --- Notes ---
     def add_note(self, note):
-        self.notes.append(note)
+        with self.lock:
+            self._store_note(note)
+            if self._note_index is not None:
+                self._note_index.add(note)
+            self._notify("add_note", note)
         return self.format_notes(note, Presenter.success(" Note added:"))
 
     def del_note(self, note):
-        if note not in self.notes:
-            return "Note not found."
-
-        deleted_text = note.text
+        with self.lock:
+            if self._notes.get(note.id) is not note:
+                return "Note not found."
 
-        self.notes.remove(note)
+            del self._notes[note.id]
+            if self._note_index is not None:
+                self._note_index.remove(note)
+            self._notify("delete_note", note.id)
 
         return self.format_notes(note, Presenter.success(" Note deleted:"))
 
     def find_note(self, query):
-        query = query.lower().strip()
-
-        for note in self.notes:
-            if query in note.text.lower() or any(
-                query in tag.lower() for tag in note.tags
-            ):
-                return note
+        matches = self.note_index.search(query)
+        return matches[0] if matches else None
 
-        return None
+    def iter_notes(self, query: str = ""):
+        """Yield notes in id order, only those matching query if given"""
+        if query:
+            yield from self.note_index.search(query)
+        else:
+            yield from self._notes.values()
 
     def search_notes(self, query=""):
         header = f"Notes matching filter: {query}" if query else " All notes"
@@ -74,13 +382,7 @@ class ContactRepository:
         if not query:
             res = self.notes
         else:
-            query = query.lower().strip()
-            res = [
-                note
-                for note in self.notes
-                if query in note.text.lower()
-                or any(query in tag.lower() for tag in note.tags)
-            ]
+            res = self.note_index.search(query)
 
         return (res, self.format_notes(res, header))
 
@@ -97,38 +399,38 @@ class ContactRepository:
             lines.append(header)
 
         if len(notes) == 1:
-            lines.append(str(notes[0]))
+            lines.append(self._note_line(notes[0]))
         else:
             for i, note in enumerate(notes, start=1):
-                lines.append(f"{i}. {str(note)}")
+                lines.append(f"{i}. {self._note_line(note)}")
 
         return "\n".join(lines)
 
     def edit_note(self, note, new_text=None, new_tags=None):
-        if note not in self.notes:
-            return "Note not found."
+        with self.lock:
+            if self._notes.get(note.id) is not note:
+                return "Note not found."
 
-        if new_text is not None and len(new_text) > 0:
-            note.text = new_text
+            if new_text is not None and len(new_text) > 0:
+                note.text = new_text
 
-        if new_tags is not None and len(new_tags) > 0:
-            note.tags = new_tags
+            if new_tags is not None and len(new_tags) > 0:
+                note.tags = new_tags
 
+            if self._note_index is not None:
+                self._note_index.add(note)
+            self._notify("edit_note", note.id, note)
         return self.format_notes(note, Presenter.success(" Note updated:"))
 
-    def notes_by_tags(self, notes=None):
-        if not notes:
-            notes = self.notes
-
-        tag_map = defaultdict(list)
-        no_tag_notes = []
+    @staticmethod
+    def _note_line(note) -> str:
+        return f"#{note.id} {note}" if note.id is not None else str(note)
 
-        for note in notes:
-            if note.tags:
-                for tag in note.tags:
-                    tag_map[tag].append(note)
-            else:
-                no_tag_notes.append(note)
+    def notes_by_tags(self, notes=None):
+        if notes:
+            tag_map, no_tag_notes = self._group_by_tags(notes)
+        else:
+            tag_map, no_tag_notes = self._all_notes_by_tags()
 
         output_lines = []
 
@@ -147,3 +449,27 @@ class ContactRepository:
             return "\n".join(output_lines)
 
         return "No notes to show."
+
+    def _store_note(self, note):
+        # Keep ids loaded from storage; give new (or clashing) notes the next one
+        if note.id is None or note.id in self._notes:
+            note.id = self.next_note_id
+        self._notes[note.id] = note
+        self.next_note_id = max(self.next_note_id, note.id + 1)
+
+    def _all_notes_by_tags(self):
+        return self.note_index.tag_groups()
+
+    @staticmethod
+    def _group_by_tags(notes):
+        tag_map = defaultdict(list)
+        no_tag_notes = []
+
+        for note in notes:
+            if note.tags:
+                for tag in note.tags:
+                    tag_map[tag].append(note)
+            else:
+                no_tag_notes.append(note)
+
+        return tag_map, no_tag_notes
@@ -0,0 +1,676 @@
+import sqlite3
+import threading
+import weakref
+from collections import Counter
+from collections.abc import Mapping
+
+from models.contact import Record
+from models.note import Note
+
+from repositories.contact_repository import ContactRepository
+from search.birthday_index import BirthdayIndex
+from search.field_index import email_key, phone_key
+from search.name_index import fold_name
+from search.search_index import query_ngram_list
+from search.search_service import SearchService
+from cli.presenter import Presenter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    address TEXT,
+    birthday TEXT,
+    birth_month INTEGER,
+    birth_day INTEGER,
+    search_text TEXT NOT NULL,
+    name_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_birthday ON contacts (birth_month, birth_day);
+
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    phone TEXT NOT NULL,
+    phone_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_phones_contact ON phones (contact_id, position);
+
+CREATE TABLE IF NOT EXISTS emails (
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_emails_contact ON emails (contact_id, position);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    search_text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_note_tags_note ON note_tags (note_id, position);
+CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags (tag);
+"""
+
+# Trigram full-text index kept in sync with contacts.search_text (needs FTS5)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5 (
+    search_text, content='contacts', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_fts (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+    INSERT INTO contacts_fts (contacts_fts, rowid, search_text)
+    VALUES ('delete', old.id, old.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts BEGIN
+    INSERT INTO contacts_fts (contacts_fts, rowid, search_text)
+    VALUES ('delete', old.id, old.search_text);
+    INSERT INTO contacts_fts (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+"""
+
+# Lookup keys derived from a stored column, created and filled if missing:
+# (table, key column, source column, function computing the key)
+KEY_COLUMNS = (
+    ("contacts", "name_key", "name", fold_name),
+    ("phones", "phone_key", "phone", phone_key),
+    ("emails", "email_key", "email", email_key),
+)
+
+# Indexes on the key columns, created once the columns exist
+KEY_SCHEMA = """
+DROP INDEX IF EXISTS idx_contacts_name_nocase;
+CREATE INDEX IF NOT EXISTS idx_contacts_name_key ON contacts (name_key, name);
+DROP INDEX IF EXISTS idx_phones_phone;
+CREATE INDEX IF NOT EXISTS idx_phones_key ON phones (phone_key);
+DROP INDEX IF EXISTS idx_emails_email;
+DROP INDEX IF EXISTS idx_emails_email_nocase;
+CREATE INDEX IF NOT EXISTS idx_emails_key ON emails (email_key);
+"""
+
+# Sorts after every character, closing the name_key range of a prefix
+KEY_RANGE_END = "\U0010ffff"
+
+# Contacts materialized per query while iterating the whole table
+BATCH_SIZE = 500
+
+
+class SQLiteContacts(Mapping):
+    """Read-only name -> Record view over the contacts table"""
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __getitem__(self, name):
+        record = self._repository.find_contact(name)
+        if record is None:
+            raise KeyError(name)
+        return record
+
+    def __iter__(self):
+        for (name,) in self._repository.connection.execute(
+            "SELECT name FROM contacts ORDER BY id"
+        ):
+            yield name
+
+    def __len__(self):
+        return self._repository.connection.execute(
+            "SELECT COUNT(*) FROM contacts"
+        ).fetchone()[0]
+
+    def __contains__(self, name):
+        return self._repository.has_contact(name)
+
+    def values(self):
+        return self._repository.iter_contacts()
+
+
+class SQLiteBirthdays(BirthdayIndex):
+    """BirthdayIndex answered by the (birth_month, birth_day) index of contacts"""
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __len__(self):
+        return self._repository.connection.execute(
+            "SELECT COUNT(*) FROM contacts WHERE birth_month IS NOT NULL"
+        ).fetchone()[0]
+
+    def add(self, key, birth_date):
+        raise TypeError("SQLite birthdays follow the contacts table")
+
+    def remove(self, key):
+        raise TypeError("SQLite birthdays follow the contacts table")
+
+    def bucket(self, month: int, day: int) -> list:
+        return [
+            name
+            for (name,) in self._repository.connection.execute(
+                "SELECT name FROM contacts WHERE birth_month = ? AND birth_day = ? "
+                "ORDER BY id",
+                (month, day),
+            )
+        ]
+
+
+class SQLiteContactRepository(ContactRepository):
+    """ContactRepository whose contacts and notes live in indexed SQLite tables.
+
+    Records are materialized only when a query returns them and are kept in
+    an identity map while in use, so edits made by the command handlers reach
+    the database through update_contact. Every mutation is committed at once.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.search_service = SearchService()
+        self._search_index = None
+        self._listeners = []
+        self.lock = threading.RLock()
+        self.generation = 0
+        self._records = weakref.WeakValueDictionary()
+        self._notes = weakref.WeakValueDictionary()
+
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self._add_key_columns()
+        self.connection.executescript(KEY_SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self._full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: substring search scans search_text
+            self._full_text = False
+        self.connection.commit()
+
+    @property
+    def contacts(self):
+        return SQLiteContacts(self)
+
+    @property
+    def notes(self):
+        return self._select_notes("SELECT id, text FROM notes ORDER BY id")
+
+    def get_note(self, note_id: int):
+        notes = self._select_notes(
+            "SELECT id, text FROM notes WHERE id = ?", (note_id,)
+        )
+        return notes[0] if notes else None
+
+    @property
+    def birthday_index(self):
+        return SQLiteBirthdays(self)
+
+    @property
+    def birthday_columns(self):
+        # The (birth_month, birth_day) index already limits queries to the window
+        return None
+
+    def commit(self):
+        self.connection.commit()
+
+    def snapshot(self) -> ContactRepository:
+        """In-memory copy of the stored contacts and notes, sharing the records.
+
+        Saving this repository never needs one, every change is committed
+        as it happens; it lets the book be written to the other storages.
+        """
+        with self.lock:
+            view = ContactRepository()
+            view.contacts = {record.name.value: record for record in self.iter_contacts()}
+            view.notes = self.notes
+        return view
+
+    def _add_key_columns(self):
+        """Add and fill the KEY_COLUMNS missing from databases of older versions"""
+        for table, column, source, key in KEY_COLUMNS:
+            columns = [
+                row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")
+            ]
+            if column in columns:
+                continue
+            with self.connection:
+                self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+                self.connection.executemany(
+                    f"UPDATE {table} SET {column} = ? WHERE rowid = ?",
+                    [
+                        (key(value), rowid)
+                        for rowid, value in self.connection.execute(
+                            f"SELECT rowid, {source} FROM {table}"
+                        ).fetchall()
+                    ],
+                )
+
+    def close(self):
+        self.connection.close()
+
+    def import_repository(self, repository: ContactRepository):
+        """Copy all contacts and notes of an in-memory repository in one transaction"""
+        with self.connection:
+            for record in repository.contacts.values():
+                self._write_contact(record)
+            for note in repository.notes:
+                self._write_note(note, keep_id=True)
+
+    # --- Contacts ---
+    def add_contact(self, record: Record):
+        """Add a new contact or update existing one"""
+        with self.connection:
+            self._write_contact(record)
+        self._records[record.name.value] = record
+        self._notify("put_contact", record)
+
+    def add_contacts(self, records):
+        """Add or update many contacts in one transaction"""
+        records = list(records)
+        with self.connection:
+            for record in records:
+                self._write_contact(record)
+        for record in records:
+            self._records[record.name.value] = record
+        self._notify("put_contacts", records)
+
+    def update_contact(self, record: Record):
+        """Write the edited fields of a stored contact"""
+        self.add_contact(record)
+
+    def find_contact(self, name: str) -> Record:
+        """Find a contact by name"""
+        record = self._records.get(name)
+        if record is not None:
+            return record
+
+        rows = self.connection.execute(
+            "SELECT id, name, address, birthday FROM contacts WHERE name = ?", (name,)
+        ).fetchall()
+        if not rows:
+            # Case-insensitive fallback, used only when it is unambiguous
+            rows = self.connection.execute(
+                "SELECT id, name, address, birthday FROM contacts "
+                "WHERE name_key = ? LIMIT 2",
+                (fold_name(name),),
+            ).fetchall()
+            if len(rows) != 1:
+                return None
+        records = self._materialize(rows)
+        return records[0] if records else None
+
+    def names_with_prefix(self, prefix: str, limit: int = None) -> list:
+        """Up to limit contact names starting with prefix ignoring case, sorted"""
+        folded = fold_name(prefix)
+        return [
+            name
+            for (name,) in self.connection.execute(
+                "SELECT name FROM contacts WHERE name_key >= ? AND name_key < ? "
+                "ORDER BY name_key, name LIMIT ?",
+                (folded, folded + KEY_RANGE_END, -1 if limit is None else limit),
+            )
+        ]
+
+    def delete_contact(self, name: str):
+        """Delete a contact by name"""
+        with self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM contacts WHERE name = ?", (name,)
+            ).rowcount
+        if not deleted:
+            return False
+        self._records.pop(name, None)
+        self._notify("delete_contact", name)
+        return True
+
+    def get_all_contacts(self):
+        """Get all contacts"""
+        return list(self.iter_contacts())
+
+    def iter_contacts(self, offset: int = 0, limit: int = None):
+        """Yield contacts in insertion order from offset, at most limit of them.
+
+        Rows are fetched BATCH_SIZE per query, continuing from the last id seen.
+        """
+        last_id = 0
+        if offset:
+            row = self.connection.execute(
+                "SELECT id FROM contacts ORDER BY id LIMIT 1 OFFSET ?", (offset - 1,)
+            ).fetchone()
+            if row is None:
+                return
+            last_id = row[0]
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch = BATCH_SIZE if remaining is None else min(BATCH_SIZE, remaining)
+            rows = self.connection.execute(
+                "SELECT id, name, address, birthday FROM contacts "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch),
+            ).fetchall()
+            if not rows:
+                return
+            yield from self._materialize(rows)
+            last_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def has_contact(self, name: str) -> bool:
+        """Check if contact exists"""
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM contacts WHERE name = ?", (name,)
+            ).fetchone()
+            is not None
+        )
+
+    def find_by_phone(self, phone: str) -> list:
+        """Contacts having phone, compared in its normalize_phone form"""
+        key = phone_key(phone)
+        if key is None:
+            return []
+        rows = self.connection.execute(
+            "SELECT id, name, address, birthday FROM contacts WHERE id IN "
+            "(SELECT contact_id FROM phones WHERE phone_key = ?) ORDER BY id",
+            (key,),
+        ).fetchall()
+        return self._materialize(rows)
+
+    def find_by_email(self, email: str) -> list:
+        """Contacts having email, compared case-insensitively"""
+        key = email_key(email)
+        if key is None:
+            return []
+        rows = self.connection.execute(
+            "SELECT id, name, address, birthday FROM contacts WHERE id IN "
+            "(SELECT contact_id FROM emails WHERE email_key = ?) ORDER BY id",
+            (key,),
+        ).fetchall()
+        return self._materialize(rows)
+
+    def search_contacts(self, query: str):
+        return list(self.iter_search_contacts(query))
+
+    def iter_search_contacts(self, query: str):
+        """Yield the contacts of search_contacts, fetched BATCH_SIZE per query"""
+        source, condition, pattern = self._search_clause(query)
+        sql = (
+            f"SELECT c.id, c.name, c.address, c.birthday FROM {source} "
+            f"WHERE {condition} AND c.id > ? ORDER BY c.id LIMIT ?"
+        )
+
+        last_id = 0
+        while True:
+            rows = self.connection.execute(
+                sql, (pattern, last_id, BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            yield from self._materialize(rows)
+            last_id = rows[-1][0]
+
+    def search_contacts_page(self, query: str, offset: int, limit: int) -> tuple:
+        """(count of search_contacts matches, the limit of them from offset)
+
+        The search runs once, for the ids of all matches; only the ids of
+        the page are then read back as contacts, BATCH_SIZE per query.
+        """
+        source, condition, pattern = self._search_clause(query)
+        ids = [
+            row[0]
+            for row in self.connection.execute(
+                f"SELECT c.id FROM {source} WHERE {condition} ORDER BY c.id",
+                (pattern,),
+            )
+        ]
+        page = ids[offset : offset + limit]
+        rows = []
+        for start in range(0, len(page), BATCH_SIZE):
+            batch = page[start : start + BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            rows.extend(
+                self.connection.execute(
+                    "SELECT id, name, address, birthday FROM contacts "
+                    f"WHERE id IN ({placeholders}) ORDER BY id",
+                    batch,
+                )
+            )
+        return len(ids), self._materialize(rows)
+
+    def _search_clause(self, query: str) -> tuple:
+        """(FROM source, WHERE condition, pattern) matching contacts "c" to query"""
+        query = query.lower()
+        if self._full_text:
+            return (
+                "contacts_fts f JOIN contacts c ON c.id = f.rowid",
+                "f.search_text GLOB ?",
+                f"*{self._escape_glob(query)}*",
+            )
+        return "contacts c", "instr(c.search_text, ?) > 0", query
+
+    def search_closest_contacts(self, query: str):
+        return self.search_service.fuzzy_search(self.contacts, query, index=self)
+
+    def overlap_ranking(self, query: str):
+        """Yield (name, id, shared) as SearchIndex.overlap_ranking does"""
+        grams = Counter(query_ngram_list(query.lower()))
+        if not grams:
+            return
+
+        overlap = " + ".join("(instr(search_text, ?) > 0) * ?" for _ in grams)
+        params = [value for gram, repeats in grams.items() for value in (gram, repeats)]
+        if self._full_text:
+            match = " OR ".join('"{}"'.format(g.replace('"', '""')) for g in grams)
+            candidates = "id IN (SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?)"
+            params.append(match)
+        else:
+            candidates = "1"
+
+        for contact_id, name, shared in self.connection.execute(
+            f"SELECT id, name, {overlap} AS overlap FROM contacts "
+            f"WHERE {candidates} AND overlap > 0 "
+            "ORDER BY overlap DESC, id",
+            params,
+        ):
+            yield name, contact_id, shared
+
+    def _write_contact(self, record: Record):
+        birthday = record.birthday.value if record.birthday else None
+        self.connection.execute(
+            "INSERT INTO contacts "
+            "(name, address, birthday, birth_month, birth_day, search_text, name_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET address = excluded.address, "
+            "birthday = excluded.birthday, birth_month = excluded.birth_month, "
+            "birth_day = excluded.birth_day, search_text = excluded.search_text",
+            (
+                record.name.value,
+                record.address.value if record.address else None,
+                str(record.birthday) if record.birthday else None,
+                birthday.month if birthday else None,
+                birthday.day if birthday else None,
+                self.search_service.build_document(record),
+                fold_name(record.name.value),
+            ),
+        )
+        (contact_id,) = self.connection.execute(
+            "SELECT id FROM contacts WHERE name = ?", (record.name.value,)
+        ).fetchone()
+
+        self.connection.execute("DELETE FROM phones WHERE contact_id = ?", (contact_id,))
+        self.connection.executemany(
+            "INSERT INTO phones (contact_id, position, phone, phone_key) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (contact_id, i, p.value, phone_key(p.value))
+                for i, p in enumerate(record.phones)
+            ],
+        )
+        self.connection.execute("DELETE FROM emails WHERE contact_id = ?", (contact_id,))
+        self.connection.executemany(
+            "INSERT INTO emails (contact_id, position, email, email_key) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (contact_id, i, e.value, email_key(e.value))
+                for i, e in enumerate(record.emails)
+            ],
+        )
+
+    def _materialize(self, rows) -> list:
+        """Build records for (id, name, address, birthday) rows, reusing live ones"""
+        records = []
+        missing = {}
+        for contact_id, name, address, birthday in rows:
+            record = self._records.get(name)
+            if record is None:
+                record = {
+                    "name": name,
+                    "phones": [],
+                    "emails": [],
+                    "address": address,
+                    "birthday": birthday,
+                }
+                missing[contact_id] = record
+            records.append(record)
+
+        for start in range(0, len(missing), BATCH_SIZE):
+            ids = list(missing)[start : start + BATCH_SIZE]
+            placeholders = ", ".join("?" * len(ids))
+            for table, column in (("phones", "phone"), ("emails", "email")):
+                for contact_id, value in self.connection.execute(
+                    f"SELECT contact_id, {column} FROM {table} "
+                    f"WHERE contact_id IN ({placeholders}) "
+                    "ORDER BY contact_id, position",
+                    ids,
+                ):
+                    missing[contact_id][f"{column}s"].append(value)
+
+        for i, record in enumerate(records):
+            if isinstance(record, dict):
+                record = Record.from_dict(record, trusted=True)
+                self._records[record.name.value] = record
+                records[i] = record
+        return records
+
+    @staticmethod
+    def _escape_glob(text: str) -> str:
+        return "".join(f"[{c}]" if c in "*?[" else c for c in text)
+
+    # --- Notes ---
+    def add_note(self, note):
+        with self.connection:
+            self._write_note(note)
+        self._notify("add_note", note)
+        return self.format_notes(note, Presenter.success(" Note added:"))
+
+    def del_note(self, note):
+        if self._notes.get(note.id) is not note:
+            return "Note not found."
+
+        with self.connection:
+            self.connection.execute("DELETE FROM notes WHERE id = ?", (note.id,))
+        del self._notes[note.id]
+        self._notify("delete_note", note.id)
+
+        return self.format_notes(note, Presenter.success(" Note deleted:"))
+
+    def find_note(self, query):
+        notes = self._select_notes(
+            "SELECT id, text FROM notes WHERE instr(search_text, ?) > 0 "
+            "ORDER BY id LIMIT 1",
+            (query.lower().strip(),),
+        )
+        return notes[0] if notes else None
+
+    def search_notes(self, query=""):
+        header = f"Notes matching filter: {query}" if query else " All notes"
+
+        if not query:
+            res = self.notes
+        else:
+            res = self._select_notes(
+                "SELECT id, text FROM notes WHERE instr(search_text, ?) > 0 "
+                "ORDER BY id",
+                (query.lower().strip(),),
+            )
+
+        return (res, self.format_notes(res, header))
+
+    def iter_notes(self, query: str = ""):
+        """Yield notes in id order (matching query if given), BATCH_SIZE per query"""
+        condition = "instr(search_text, ?) > 0 AND " if query else ""
+        params = (query.lower().strip(),) if query else ()
+        last_id = 0
+        while True:
+            notes = self._select_notes(
+                f"SELECT id, text FROM notes WHERE {condition}id > ? "
+                "ORDER BY id LIMIT ?",
+                (*params, last_id, BATCH_SIZE),
+            )
+            if not notes:
+                return
+            yield from notes
+            last_id = notes[-1].id
+
+    def edit_note(self, note, new_text=None, new_tags=None):
+        if self._notes.get(note.id) is not note:
+            return "Note not found."
+
+        if new_text is not None and len(new_text) > 0:
+            note.text = new_text
+
+        if new_tags is not None and len(new_tags) > 0:
+            note.tags = new_tags
+
+        with self.connection:
+            self._write_note(note, note.id)
+        self._notify("edit_note", note.id, note)
+        return self.format_notes(note, Presenter.success(" Note updated:"))
+
+    def _all_notes_by_tags(self):
+        return self._group_by_tags(self.notes)
+
+    def _write_note(self, note, note_id=None, keep_id=False):
+        search_text = "\n".join([note.text.lower(), *(t.lower() for t in note.tags)])
+        if note_id is None:
+            # A NULL id lets SQLite pick the next free one
+            note_id = self.connection.execute(
+                "INSERT INTO notes (id, text, search_text) VALUES (?, ?, ?)",
+                (note.id if keep_id else None, note.text, search_text),
+            ).lastrowid
+            note.id = note_id
+            self._notes[note_id] = note
+        else:
+            self.connection.execute(
+                "UPDATE notes SET text = ?, search_text = ? WHERE id = ?",
+                (note.text, search_text, note_id),
+            )
+            self.connection.execute("DELETE FROM note_tags WHERE note_id = ?", (note_id,))
+
+        self.connection.executemany(
+            "INSERT INTO note_tags (note_id, position, tag) VALUES (?, ?, ?)",
+            [(note_id, i, tag) for i, tag in enumerate(note.tags)],
+        )
+
+    def _select_notes(self, sql: str, params=()) -> list:
+        notes = []
+        for note_id, text in self.connection.execute(sql, params).fetchall():
+            note = self._notes.get(note_id)
+            if note is None:
+                tags = [
+                    tag
+                    for (tag,) in self.connection.execute(
+                        "SELECT tag FROM note_tags WHERE note_id = ? ORDER BY position",
+                        (note_id,),
+                    )
+                ]
+                note = Note(text, tags, note_id)
+                self._notes[note_id] = note
+            notes.append(note)
+        return notes
@@ -0,0 +1,120 @@
+# search/birthday_columns.py
+from array import array
+from calendar import isleap
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # optional: BirthdayIndex answers the same queries
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Days before the first of each month
+DAYS_BEFORE_MONTH = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+DAYS_BEFORE_MONTH_LEAP = [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335]
+
+
+class BirthdayColumns:
+    """Birth year, month and day of every key in parallel arrays.
+
+    Rows are updated in place and a removed key leaves a hole (month 0) that
+    is reclaimed once holes make up half of the rows. Queries copy the
+    columns into NumPy arrays and compute next birthdays, weekend shifts and
+    ages for all rows at once.
+    """
+
+    def __init__(self):
+        if not HAS_NUMPY:
+            raise ImportError("BirthdayColumns requires numpy")
+        self._keys = []
+        self._rows = {}
+        self._years = array("H")
+        self._months = array("B")
+        self._days = array("B")
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, key, birth_date: date):
+        """Store birth_date for key, replacing its previous birthday"""
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            self._years.append(birth_date.year)
+            self._months.append(birth_date.month)
+            self._days.append(birth_date.day)
+        else:
+            self._years[row] = birth_date.year
+            self._months[row] = birth_date.month
+            self._days[row] = birth_date.day
+
+    def remove(self, key):
+        """Remove key (no-op for unknown keys)"""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._keys[row] = None
+        self._months[row] = 0
+        if len(self._rows) * 2 < len(self._keys):
+            self._compact()
+
+    def upcoming(self, start: date, days: int, weekend_shifts: dict) -> list:
+        """(key, next birthday, congratulation date, age) within days of start.
+
+        Next birthdays follow BirthdayService._get_next_birthday: Feb 29
+        birthdays fall on Feb 28 in common years. weekend_shifts maps a
+        weekday (Monday is 0) to the days a congratulation moves ahead.
+        Rows come in storage order.
+        """
+        months = np.frombuffer(self._months, dtype=np.uint8).astype(np.int64)
+        month_days = np.frombuffer(self._days, dtype=np.uint8).astype(np.int64)
+        years = np.frombuffer(self._years, dtype=np.uint16).astype(np.int64)
+
+        start_day = np.datetime64(start, "D")
+        this_year = self._dates_in_year(start.year, months, month_days)
+        passed = this_year < start_day
+        next_birthday = np.where(
+            passed, self._dates_in_year(start.year + 1, months, month_days), this_year
+        )
+
+        offsets = (next_birthday - start_day).astype(np.int64)
+        rows = np.flatnonzero((months > 0) & (offsets <= days))
+        next_birthday = next_birthday[rows]
+
+        # 1970-01-01, day 0 of datetime64, was a Thursday
+        weekdays = (next_birthday.astype(np.int64) + 3) % 7
+        shift_table = np.array([weekend_shifts.get(d, 0) for d in range(7)])
+        congratulation = next_birthday + shift_table[weekdays]
+        ages = start.year + passed[rows] - years[rows]
+
+        keys = self._keys
+        return [
+            (keys[row], actual, congratulate, age)
+            for row, actual, congratulate, age in zip(
+                rows.tolist(),
+                next_birthday.tolist(),
+                congratulation.tolist(),
+                ages.tolist(),
+            )
+        ]
+
+    @staticmethod
+    def _dates_in_year(year: int, months, month_days):
+        leap = isleap(year)
+        days_before = np.array(DAYS_BEFORE_MONTH_LEAP if leap else DAYS_BEFORE_MONTH)
+        if not leap:
+            month_days = np.where((months == 2) & (month_days == 29), 28, month_days)
+        # Holes have month 0; their dates are computed but never selected
+        day_of_year = days_before[np.maximum(months, 1) - 1] + month_days - 1
+        return np.datetime64(date(year, 1, 1), "D") + day_of_year
+
+    def _compact(self):
+        keys = [key for key in self._keys if key is not None]
+        rows = [self._rows[key] for key in keys]
+        self._years = array("H", (self._years[row] for row in rows))
+        self._months = array("B", (self._months[row] for row in rows))
+        self._days = array("B", (self._days[row] for row in rows))
+        self._keys = keys
+        self._rows = {key: row for row, key in enumerate(keys)}
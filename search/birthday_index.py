@@ -0,0 +1,89 @@
+# search/birthday_index.py
+from calendar import isleap
+from collections import defaultdict
+from datetime import date, timedelta
+
+# Longest gap between a day and the next occurrence of the same birthday
+MAX_WINDOW_DAYS = 366
+
+
+def celebrated_on(day: date) -> list:
+    """(month, day) birthdays celebrated on day.
+
+    Feb 29 birthdays are celebrated on Feb 28 in common years, like
+    BirthdayService._replace_year does.
+    """
+    keys = [(day.month, day.day)]
+    if day.month == 2 and day.day == 28 and not isleap(day.year):
+        keys.append((2, 29))
+    return keys
+
+
+class BirthdayIndex:
+    """Keys (contact names) bucketed by the (month, day) of their birthday.
+
+    A lookup for a date touches only the buckets celebrated on that date, so
+    the cost depends on the number of matching contacts, not on the size of
+    the book.
+    """
+
+    def __init__(self):
+        self._buckets = defaultdict(dict)
+        self._days = {}
+
+    def __len__(self):
+        return len(self._days)
+
+    def add(self, key, birth_date: date):
+        """Index key under birth_date, replacing its previous birthday"""
+        self.remove(key)
+        month_day = (birth_date.month, birth_date.day)
+        self._buckets[month_day][key] = None
+        self._days[key] = month_day
+
+    def remove(self, key):
+        """Remove key from the index (no-op for unknown keys)"""
+        month_day = self._days.pop(key, None)
+        if month_day is None:
+            return
+        bucket = self._buckets[month_day]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[month_day]
+
+    def bucket(self, month: int, day: int) -> list:
+        """Keys born on month/day of any year"""
+        return list(self._buckets.get((month, day), ()))
+
+    def on(self, day: date) -> list:
+        """Keys whose birthday is celebrated on day"""
+        return [
+            key for month_day in celebrated_on(day) for key in self.bucket(*month_day)
+        ]
+
+    def upcoming(self, start: date, end: date):
+        """Yield (day, key) for the next birthday of each key from start to end.
+
+        Every key is yielded at most once, for its first birthday on or after
+        start, so windows longer than a year don't repeat anybody.
+        """
+        seen = set()
+        for offset in range(min((end - start).days, MAX_WINDOW_DAYS) + 1):
+            day = start + timedelta(days=offset)
+            for month_day in celebrated_on(day):
+                if month_day in seen:
+                    continue
+                seen.add(month_day)
+                for key in self.bucket(*month_day):
+                    yield day, key
+
+    def between(self, start: date, end: date):
+        """Yield (day, key) for every birthday celebrated from start to end.
+
+        Unlike upcoming, a key is yielded again for every year the window
+        covers.
+        """
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            for key in self.on(day):
+                yield day, key
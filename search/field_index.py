@@ -0,0 +1,59 @@
+# search/field_index.py
+from collections import defaultdict
+
+from handlers.errors import ValidationError
+from utils.utils import normalize_phone
+
+
+def phone_key(phone: str):
+    """Phone as normalize_phone writes it, or None if it can't be normalized"""
+    try:
+        return normalize_phone(phone)
+    except ValidationError:
+        return None
+
+
+def email_key(email: str):
+    """Email compared case-insensitively, or None for an empty one"""
+    return email.strip().lower() or None
+
+
+class FieldIndex:
+    """Reverse index from normalized field values to the keys holding them.
+
+    Every key (contact name) is stored with all of its values at once, so a
+    re-add after editing a record replaces whatever it held before. Lookups
+    cost one dict access regardless of the size of the book.
+    """
+
+    def __init__(self, normalize):
+        self._normalize = normalize
+        self._owners = defaultdict(dict)
+        self._values = {}
+
+    def __len__(self):
+        return len(self._owners)
+
+    def add(self, key, values):
+        """Index key under each of values, replacing its previous values"""
+        self.remove(key)
+        normalized = {self._normalize(value) for value in values} - {None}
+        for value in normalized:
+            self._owners[value][key] = None
+        if normalized:
+            self._values[key] = normalized
+
+    def remove(self, key):
+        """Remove key from the index (no-op for unknown keys)"""
+        for value in self._values.pop(key, ()):
+            owners = self._owners[value]
+            del owners[key]
+            if not owners:
+                del self._owners[value]
+
+    def owners(self, value) -> list:
+        """Keys holding value, in the order they were indexed"""
+        normalized = self._normalize(value)
+        if normalized is None:
+            return []
+        return list(self._owners.get(normalized, ()))
@@ -0,0 +1,71 @@
+# search/name_index.py
+from bisect import bisect_left
+
+
+def fold_name(name: str) -> str:
+    """Name compared case-insensitively"""
+    return name.casefold()
+
+
+class NameIndex:
+    """Contact names kept sorted by their case-folded form.
+
+    Exact and prefix lookups are a binary search followed by a walk over the
+    matching run, so they cost O(log n) plus the size of the result.
+    """
+
+    def __init__(self, names=()):
+        self._entries = sorted((fold_name(name), name) for name in names)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (name for _, name in self._entries)
+
+    def add(self, name: str):
+        """Add name (no-op if it is already indexed)"""
+        entry = (fold_name(name), name)
+        position = bisect_left(self._entries, entry)
+        if position == len(self._entries) or self._entries[position] != entry:
+            self._entries.insert(position, entry)
+
+    def remove(self, name: str):
+        """Remove name from the index (no-op for unknown names)"""
+        entry = (fold_name(name), name)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def find(self, name: str) -> list:
+        """Names equal to name ignoring case"""
+        folded = fold_name(name)
+        return [name for _, name in self._run(folded, lambda key: key == folded)]
+
+    def prefix(self, prefix: str, limit: int = None) -> list:
+        """Up to limit names starting with prefix ignoring case, sorted"""
+        folded = fold_name(prefix)
+        names = []
+        for _, name in self._run(folded, lambda key: key.startswith(folded)):
+            if limit is not None and len(names) >= limit:
+                break
+            names.append(name)
+        return names
+
+    def range(self, start: str = None, stop: str = None):
+        """Yield names from start (inclusive) to stop (exclusive) ignoring case"""
+        folded_stop = None if stop is None else fold_name(stop)
+        folded_start = "" if start is None else fold_name(start)
+        for key, name in self._run(folded_start, lambda key: True):
+            if folded_stop is not None and key >= folded_stop:
+                return
+            yield name
+
+    def _run(self, folded: str, matches):
+        position = bisect_left(self._entries, (folded,))
+        while position < len(self._entries):
+            entry = self._entries[position]
+            if not matches(entry[0]):
+                return
+            yield entry
+            position += 1
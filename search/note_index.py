@@ -0,0 +1,67 @@
+# search/note_index.py
+from search.search_index import SearchIndex
+
+# Joins note text and tags; queries never contain it, so no match spans two parts
+PART_SEPARATOR = "\n"
+
+
+def note_document(note) -> str:
+    """Lowercased text and tags of a note, as matched by note searches"""
+    return PART_SEPARATOR.join([note.text.lower(), *(t.lower() for t in note.tags)])
+
+
+class NoteIndex:
+    """Notes by tag, plus a trigram index over their text and tags.
+
+    Keys are the notes themselves. Results keep the order in which notes
+    were first indexed, which is their order in ContactRepository.notes.
+    """
+
+    def __init__(self, notes=()):
+        self._text = SearchIndex()
+        self._tags = {}
+        self._note_tags = {}
+        self._untagged = {}
+        for note in notes:
+            self.add(note)
+
+    def __len__(self):
+        return len(self._text)
+
+    def add(self, note):
+        """Index note, replacing what was indexed for it before"""
+        self._drop_tags(note)
+        self._text.add(note, note_document(note))
+        tags = list(dict.fromkeys(note.tags))
+        for tag in tags:
+            self._tags.setdefault(tag, {})[note] = None
+        self._note_tags[note] = tags
+        if not tags:
+            self._untagged[note] = None
+
+    def remove(self, note):
+        """Remove note from the index (no-op for unknown notes)"""
+        self._drop_tags(note)
+        self._text.remove(note)
+
+    def search(self, query: str) -> list:
+        """Notes whose text or one of whose tags contains query"""
+        return self._text.search(query.lower().strip())
+
+    def tag_groups(self) -> tuple[dict, list]:
+        """({tag: notes} sorted by tag, untagged notes), notes in list order"""
+        groups = {
+            tag: self._in_order(self._tags[tag]) for tag in sorted(self._tags)
+        }
+        return groups, self._in_order(self._untagged)
+
+    def _in_order(self, notes) -> list:
+        return sorted(notes, key=self._text.position)
+
+    def _drop_tags(self, note):
+        self._untagged.pop(note, None)
+        for tag in self._note_tags.pop(note, ()):
+            notes = self._tags[tag]
+            del notes[note]
+            if not notes:
+                del self._tags[tag]
@@ -0,0 +1,153 @@
+# search/search_index.py
+from collections import Counter, defaultdict
+
+NGRAM_SIZE = 3
+# Documents are padded so that texts shorter than NGRAM_SIZE still produce grams
+DOCUMENT_START = "\x02"
+DOCUMENT_END = "\x03"
+
+
+def query_ngrams(text: str) -> set:
+    """Distinct NGRAM_SIZE-character substrings of text"""
+    return set(query_ngram_list(text))
+
+
+def query_ngram_list(text: str) -> list:
+    """NGRAM_SIZE-character substrings of text at every position"""
+    return [text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)]
+
+
+def overlap_bound(query_length: int, shared: int) -> float:
+    """Upper bound of SequenceMatcher.ratio() between a query and any field of
+    a text containing `shared` of the query's trigram positions.
+
+    A matching block of length L covers L - 2 shared positions when L >= 3,
+    so M matched characters need at least ceil((M - shared) / 2) blocks.
+    Consecutive blocks are separated by an unmatched character of one side,
+    hence len(query) + len(field) >= 2 * M + blocks - 1, and the field holds
+    at least the M matched characters.
+    """
+    best = 0.0
+    for matched in range(1, query_length + 1):
+        blocks = max(1, -(-(matched - shared) // 2))
+        length = max(query_length + matched, 2 * matched + blocks - 1)
+        best = max(best, 2 * matched / length)
+    return best
+
+
+class SearchIndex:
+    """Trigram inverted index answering substring queries from posting lists.
+
+    Each document is stored under a key (contact name, note, ...) together with
+    its lowercased text. A substring query is resolved by intersecting the
+    posting lists of its trigrams and verifying the few remaining candidates,
+    so the cost no longer grows with the total size of the book.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._documents = {}
+        self._order = {}
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, key):
+        return key in self._documents
+
+    def add(self, key, text: str):
+        """Index text under key, replacing the previous text of the same key"""
+        if key in self._documents:
+            self._drop_postings(key)
+        else:
+            self._order[key] = self._sequence
+            self._sequence += 1
+
+        text = text.lower()
+        self._documents[key] = text
+        for gram in self._document_ngrams(text):
+            self._postings[gram].add(key)
+
+    def remove(self, key):
+        """Remove key from the index (no-op for unknown keys)"""
+        if key not in self._documents:
+            return
+        self._drop_postings(key)
+        del self._documents[key]
+        del self._order[key]
+
+    def position(self, key) -> int:
+        """Rank of key in insertion order"""
+        return self._order[key]
+
+    def search(self, query: str) -> list:
+        """Return keys whose text contains query, in insertion order"""
+        query = query.lower()
+        if not query:
+            return sorted(self._documents, key=self._order.__getitem__)
+
+        matches = [
+            key for key in self.candidates(query) if query in self._documents[key]
+        ]
+        matches.sort(key=self._order.__getitem__)
+        return matches
+
+    def candidates(self, query: str) -> set:
+        """Keys that may contain query (superset of the exact matches)"""
+        query = query.lower()
+
+        if len(query) < NGRAM_SIZE:
+            # Short queries: every gram containing the query points to a match
+            keys = set()
+            for gram, postings in self._postings.items():
+                if query in gram:
+                    keys |= postings
+            return keys
+
+        posting_lists = []
+        for gram in query_ngrams(query):
+            postings = self._postings.get(gram)
+            if not postings:
+                return set()
+            posting_lists.append(postings)
+
+        posting_lists.sort(key=len)
+        keys = set(posting_lists[0])
+        for postings in posting_lists[1:]:
+            keys &= postings
+            if not keys:
+                break
+        return keys
+
+    def overlap_ranking(self, query: str) -> list:
+        """(key, position, shared) of every key sharing a trigram with query.
+
+        shared counts the query trigram positions whose trigram the text
+        contains, so a trigram repeated in the query counts each time. Most
+        shared first, ties in insertion order; position is the key's rank.
+        """
+        counts = Counter()
+        for gram, repeats in Counter(query_ngram_list(query.lower())).items():
+            postings = self._postings.get(gram, ())
+            for _ in range(repeats):
+                counts.update(postings)
+
+        order = self._order
+        ranking = sorted(counts.items(), key=lambda item: (-item[1], order[item[0]]))
+        return [(key, order[key], shared) for key, shared in ranking]
+
+    def _drop_postings(self, key):
+        for gram in self._document_ngrams(self._documents[key]):
+            postings = self._postings.get(gram)
+            if postings is None:
+                continue
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    @staticmethod
+    def _document_ngrams(text: str) -> set:
+        if not text:
+            return set()
+        return query_ngrams(f"{DOCUMENT_START}{text}{DOCUMENT_END}")
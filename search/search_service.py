@@ -1,38 +1,156 @@
 # search/search_service.py
 import difflib
+import heapq
+
+from search.search_index import NGRAM_SIZE, overlap_bound
+
+FUZZY_THRESHOLD = 0.3
 
 
 class SearchService:
 
-    def exact_search(self, contacts, query):
+    def exact_search(self, contacts, query, index=None):
+        if index is not None:
+            return [contacts[name] for name in index.search(query)]
+
         query = query.lower()
         results = []
 
         for record in contacts.values():
-            fields = self.collect_fields(record)
-            combined = " ".join(fields)
-            if query in combined:
+            if query in self.build_document(record):
                 results.append(record)
 
         return results
 
-    def fuzzy_search(self, contacts, query, limit=5):
+    def fuzzy_search(self, contacts, query, limit=5, index=None):
         query = query.lower()
-        scored = []
-
-        for record in contacts.values():
-            fields = self.collect_fields(record)
-
-            best_score = 0
-            for field in fields:
-                score = difflib.SequenceMatcher(None, query, field).ratio()
-                if score > best_score:
-                    best_score = score
-
-            scored.append((best_score, record))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [record for score, record in scored if score >= 0.3][:limit]
+        if limit <= 0:
+            return []
+
+        known = {}
+        if index is not None and len(query) >= NGRAM_SIZE:
+            known, results = self._ranked_matches(contacts, query, limit, index)
+            if results is not None:
+                return results
+
+        # Typos can share no trigram at all: finish with a pass over everyone
+        return self._top_matches(contacts.items(), query, limit, known)
+
+    def _ranked_matches(self, contacts, query, limit, index):
+        """Score contacts by decreasing trigram overlap while one could still win.
+
+        index.overlap_ranking(query) yields (key, position, shared), most
+        shared first. Scoring stops once the worst of the `limit` best scores
+        exceeds overlap_bound() of the next contact, which also covers every
+        contact sharing no trigram; it gives up as soon as the next contact
+        is bounded no better than those. Returns (scores by key, results), where
+        results is None if the overlap ranking could not settle the top
+        `limit` and a full pass is needed; scores then spare it re-scoring.
+        """
+        matcher = difflib.SequenceMatcher(None, query)
+        scores = {}
+        positions = {}
+        floor = []
+        bounds = [overlap_bound(len(query), shared) for shared in range(len(query))]
+
+        def settled(shared):
+            return len(floor) == limit and floor[0] > bounds[min(shared, len(query) - 1)]
+
+        for key, position, shared in index.overlap_ranking(query):
+            if settled(shared):
+                break
+            if bounds[min(shared, len(query) - 1)] <= bounds[0]:
+                # The rest may score as high as contacts sharing nothing
+                return scores, None
+            # Ties must be kept: an equal score may come earlier in insertion order
+            score = self._best_score(
+                matcher, contacts[key], floor[0] if len(floor) == limit else None, True
+            )
+            scores[key] = score
+            if score is None:
+                continue
+            positions[key] = position
+            if len(floor) < limit:
+                heapq.heappush(floor, score)
+            elif score > floor[0]:
+                heapq.heapreplace(floor, score)
+        else:
+            if not settled(0):
+                return scores, None
+
+        ranked = [(-scores[key], position, key) for key, position in positions.items()]
+        best = heapq.nsmallest(limit, ranked)
+        return scores, [contacts[key] for _, _, key in best]
+
+    def _top_matches(self, items, query, limit, known=None):
+        """Best `limit` of (key, record) items scoring at least FUZZY_THRESHOLD.
+
+        Best first; ties keep iteration order, like a stable sort would.
+        known maps keys to scores computed already (None: cannot make the
+        results). Once the heap is full, fields whose cheap upper bounds
+        cannot beat the worst kept score skip the full SequenceMatcher.ratio().
+        """
+        if limit <= 0:
+            return []
+
+        known = known or {}
+        matcher = difflib.SequenceMatcher(None, query)
+        heap = []
+
+        for position, (key, record) in enumerate(items):
+            floor = heap[0][0] if len(heap) == limit else None
+
+            if key in known:
+                best_score = known[key]
+                if best_score is None or (floor is not None and best_score <= floor):
+                    continue
+            else:
+                best_score = self._best_score(matcher, record, floor)
+                if best_score is None:
+                    continue
+
+            entry = (best_score, -position, record)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+        heap.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [record for _, _, record in heap]
+
+    def _best_score(self, matcher, record, floor=None, keep_ties=False):
+        """Best field ratio of record, or None if none reaches FUZZY_THRESHOLD
+        and beats floor (or equals it, with keep_ties)"""
+        best_score = None
+        for field in self.collect_fields(record):
+            matcher.set_seq2(field)
+            if best_score is None:
+                bound, ties = floor, keep_ties
+            else:
+                bound, ties = best_score, False
+            if not self._may_score(matcher, bound, ties):
+                continue
+            score = matcher.ratio()
+            if score >= FUZZY_THRESHOLD and (
+                bound is None or score > bound or (ties and score == bound)
+            ):
+                best_score = score
+        return best_score
+
+    @staticmethod
+    def _may_score(matcher, bound, ties=False):
+        """Whether the field can still reach the threshold and beat bound"""
+        for upper in (matcher.real_quick_ratio, matcher.quick_ratio):
+            limit = upper()
+            if limit < FUZZY_THRESHOLD:
+                return False
+            if bound is not None and (limit < bound or (limit == bound and not ties)):
+                return False
+        return True
+
+    def build_document(self, record):
+        """Searchable text of a record, as matched by exact_search"""
+        return " ".join(self.collect_fields(record))
 
     def collect_fields(self, record):
         fields = []
@@ -25,9 +25,11 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=["colorama", "rich", "prompt_toolkit"],
+    extras_require={"numpy": ["numpy"]},
     entry_points={
         "console_scripts": [
             "assistant-bot-G30=main:main",
+            "assistant-bot-G30-birthdays=cli.birthday_report:main",
         ],
     },
 )
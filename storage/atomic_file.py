@@ -0,0 +1,63 @@
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+# Previous versions kept next to the data file; "<name>.1" is the newest
+BACKUP_COUNT = 3
+
+
+def backup_paths(path: Path, count: int = BACKUP_COUNT) -> list[Path]:
+    """Backup files of path, newest first"""
+    return [path.with_name(f"{path.name}.{i}") for i in range(1, count + 1)]
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "wb", backups: int = BACKUP_COUNT, **kwargs):
+    """Open a temp file that replaces path only once it is completely on disk.
+
+    The temp file is fsynced and renamed over path, so a crash leaves either
+    the old or the new version, never a truncated one, and path exists at
+    every moment. The replaced version is kept as the newest of `backups`
+    numbered copies, hard-linked (or copied) before the rename.
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if backups and path.exists():
+        _rotate_backups(path, backups)
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+def _rotate_backups(path: Path, count: int):
+    paths = backup_paths(path, count)
+    for older, newer in zip(reversed(paths[1:]), reversed(paths[:-1])):
+        if newer.exists():
+            os.replace(newer, older)
+    # Link rather than move the live file, so path never goes missing
+    newest = paths[0]
+    newest.unlink(missing_ok=True)
+    try:
+        os.link(path, newest)
+    except OSError:
+        # File systems without hard links
+        shutil.copy2(path, newest)
+
+
+def _fsync_directory(directory: Path):
+    # Makes the rename itself durable; directories can't be opened on Windows
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,68 @@
+import threading
+
+# Seconds between checks for unsaved changes
+AUTOSAVE_INTERVAL = 30
+# Unsaved mutations that trigger a save before the interval elapses
+AUTOSAVE_AFTER = 20
+
+
+class AutosaveWorker(threading.Thread):
+    """Background thread saving the repository through a StorageInterface.
+
+    Wakes up every `interval` seconds, or as soon as `max_pending` mutations
+    have accumulated, and writes a copy-on-write snapshot of the repository.
+    Only taking the snapshot holds the repository lock; serializing and
+    writing it happen outside, so the prompt loop is never kept waiting on
+    disk I/O. Nothing is written while the repository generation equals the
+    last saved one.
+    """
+
+    def __init__(
+        self,
+        storage,
+        repository,
+        interval: float = AUTOSAVE_INTERVAL,
+        max_pending: int = AUTOSAVE_AFTER,
+    ):
+        super().__init__(name="autosave", daemon=True)
+        self._storage = storage
+        self._repository = repository
+        self._interval = interval
+        self._max_pending = max_pending
+        self._saved_generation = repository.generation
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._save_lock = threading.Lock()
+        repository.subscribe(self._on_mutation)
+
+    def run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            if not self._stopped.is_set():
+                self.save_if_dirty()
+
+    def stop(self):
+        """Stop the thread, waiting for a save in progress to finish"""
+        self._stopped.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join()
+
+    def save_if_dirty(self) -> bool:
+        """Save a snapshot if the repository changed since the last save"""
+        with self._save_lock:
+            with self._repository.lock:
+                generation = self._repository.generation
+                if generation == self._saved_generation:
+                    return False
+                snapshot = self._repository.snapshot()
+
+            if not self._storage.save(snapshot):
+                return False
+            self._saved_generation = generation
+            return True
+
+    def _on_mutation(self, event: str, *payload):
+        if self._repository.generation - self._saved_generation >= self._max_pending:
+            self._wake.set()
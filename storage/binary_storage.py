@@ -0,0 +1,258 @@
+import gc
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+from models.address import Address
+from models.birthday import Birthday
+from models.contact import Record
+from models.email import Email
+from models.note import Note
+from models.phone import Phone
+from repositories.contact_repository import ContactRepository
+from storage.atomic_file import atomic_write
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+MAGIC = b"AB30"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHH")
+COUNT = struct.Struct("<I")
+
+# Missing address in the address column
+NO_STRING = 0xFFFFFFFF
+# Phones that are not 12 plain digits are kept as strings: flag | string index
+STRING_PHONE = 1 << 63
+STRING_SEPARATOR = "\x00"
+
+for _typecode, _size in (("H", 2), ("I", 4), ("Q", 8)):
+    if array(_typecode).itemsize != _size:
+        raise ImportError(f"array('{_typecode}') is not {_size} bytes wide")
+
+
+class BinaryStorage(StorageInterface):
+    """Compact, versioned binary snapshot of the address book.
+
+    Layout (little-endian), version 2:
+
+        header     magic "AB30", u16 version, u16 reserved
+        strings    u32 count, u32 byte size, NUL-separated UTF-8 blob
+        contacts   u32 count, then one column per field:
+                   u32 name, u32 address (NO_STRING if none),
+                   u32 birthday as date ordinal (0 if none),
+                   u16 phone count, u32 total + u64 phones,
+                   u16 email count, u32 total + u32 emails
+        notes      u32 count, u32 id, u32 text, u16 tag count,
+                   u32 total + u32 tags
+
+    Version 1 files have no note id column; their notes are numbered on load.
+
+    Every string lives once in the string table and is referenced by index.
+    A phone that is 12 plain digits is stored as the integer itself. Columns
+    are read with one array.frombytes per column from a single read() buffer.
+    """
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        content = encode_repository(data)
+        with atomic_write(self.file_path, "wb") as f:
+            f.write(content)
+        return True
+
+    @handle_load_errors
+    def load(self) -> object:
+        with open(self.file_path, "rb") as f:
+            buffer = f.read()
+
+        # Only new, acyclic objects are created: collector passes are pure overhead
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return decode_repository(buffer)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+
+def encode_repository(repository) -> bytes:
+    strings = _StringTable()
+
+    names, addresses, birthdays = array("I"), array("I"), array("I")
+    phone_counts, phones = array("H"), array("Q")
+    email_counts, emails = array("H"), array("I")
+    for record in repository.contacts.values():
+        names.append(strings.add(record.name.value))
+        addresses.append(
+            strings.add(record.address.value) if record.address else NO_STRING
+        )
+        birthdays.append(record.birthday.value.toordinal() if record.birthday else 0)
+        phone_counts.append(len(record.phones))
+        phones.extend(_pack_phone(p.value, strings) for p in record.phones)
+        email_counts.append(len(record.emails))
+        emails.extend(strings.add(e.value) for e in record.emails)
+
+    note_ids, texts, tag_counts, tags = array("I"), array("I"), array("H"), array("I")
+    for note in repository.notes:
+        note_ids.append(note.id)
+        texts.append(strings.add(note.text))
+        tag_counts.append(len(note.tags))
+        tags.extend(strings.add(tag) for tag in note.tags)
+
+    blob = STRING_SEPARATOR.join(strings.values).encode("utf-8")
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, 0),
+        COUNT.pack(len(strings.values)),
+        COUNT.pack(len(blob)),
+        blob,
+        COUNT.pack(len(names)),
+        *(_to_bytes(column) for column in (names, addresses, birthdays)),
+        _to_bytes(phone_counts),
+        COUNT.pack(len(phones)),
+        _to_bytes(phones),
+        _to_bytes(email_counts),
+        COUNT.pack(len(emails)),
+        _to_bytes(emails),
+        COUNT.pack(len(texts)),
+        _to_bytes(note_ids),
+        _to_bytes(texts),
+        _to_bytes(tag_counts),
+        COUNT.pack(len(tags)),
+        _to_bytes(tags),
+    ]
+    return b"".join(parts)
+
+
+def decode_repository(buffer: bytes) -> ContactRepository:
+    reader = _Reader(buffer)
+    magic, version, _ = reader.struct(HEADER)
+    if magic != MAGIC:
+        raise ValueError("Not an address book binary file")
+    if version not in (1, FORMAT_VERSION):
+        raise ValueError(f"Unsupported binary format version: {version}")
+
+    string_count = reader.count()
+    blob = reader.bytes(reader.count())
+    strings = blob.decode("utf-8").split(STRING_SEPARATOR) if string_count else []
+
+    contact_count = reader.count()
+    names = reader.array("I", contact_count)
+    addresses = reader.array("I", contact_count)
+    birthdays = reader.array("I", contact_count)
+    phone_counts = reader.array("H", contact_count)
+    phones = reader.array("Q", reader.count())
+    email_counts = reader.array("H", contact_count)
+    emails = reader.array("I", reader.count())
+
+    phone_values = [_unpack_phone(p, strings) for p in phones]
+    email_values = [strings[e] for e in emails]
+
+    repository = ContactRepository()
+    contacts = repository.contacts
+    phone_pos = email_pos = 0
+    for name, address, birthday, phone_count, email_count in zip(
+        names, addresses, birthdays, phone_counts, email_counts
+    ):
+        record = Record(strings[name])
+        if address != NO_STRING:
+            record.address = Address.restore(strings[address])
+        if birthday:
+            record.birthday = Birthday.restore(datetime.fromordinal(birthday))
+        if phone_count:
+            end = phone_pos + phone_count
+            record.phones = [Phone.restore(p) for p in phone_values[phone_pos:end]]
+            phone_pos = end
+        if email_count:
+            end = email_pos + email_count
+            record.emails = [Email.restore(e) for e in email_values[email_pos:end]]
+            email_pos = end
+        contacts[record.name.value] = record
+
+    note_count = reader.count()
+    note_ids = reader.array("I", note_count) if version >= 2 else [None] * note_count
+    texts = reader.array("I", note_count)
+    tag_counts = reader.array("H", note_count)
+    tags = reader.array("I", reader.count())
+
+    notes = []
+    tag_pos = 0
+    for i in range(note_count):
+        end = tag_pos + tag_counts[i]
+        notes.append(
+            Note(
+                strings[texts[i]],
+                [strings[t] for t in tags[tag_pos:end]],
+                note_ids[i],
+            )
+        )
+        tag_pos = end
+    repository.notes = notes
+
+    return repository
+
+
+class _StringTable:
+    """Interns strings and hands out their index in the table"""
+
+    def __init__(self):
+        self.values = []
+        self._indexes = {}
+
+    def add(self, value: str) -> int:
+        index = self._indexes.get(value)
+        if index is None:
+            if STRING_SEPARATOR in value:
+                raise ValueError(f"Can't store text containing NUL: {value!r}")
+            index = self._indexes[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class _Reader:
+    """Sequential reader over one in-memory buffer"""
+
+    def __init__(self, buffer: bytes):
+        self._buffer = memoryview(buffer)
+        self._offset = 0
+
+    def struct(self, layout: struct.Struct) -> tuple:
+        values = layout.unpack_from(self._buffer, self._offset)
+        self._offset += layout.size
+        return values
+
+    def count(self) -> int:
+        return self.struct(COUNT)[0]
+
+    def bytes(self, size: int) -> bytes:
+        chunk = self._buffer[self._offset : self._offset + size]
+        if len(chunk) != size:
+            raise ValueError("Binary file is truncated")
+        self._offset += size
+        return bytes(chunk)
+
+    def array(self, typecode: str, length: int) -> array:
+        column = array(typecode)
+        column.frombytes(self.bytes(length * column.itemsize))
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
+
+
+def _to_bytes(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _pack_phone(value: str, strings: _StringTable) -> int:
+    # Phone keeps the text as typed: only canonical 12-digit numbers pack losslessly
+    if len(value) == 12 and value.isascii() and value.isdigit() and value[0] != "0":
+        return int(value)
+    return STRING_PHONE | strings.add(value)
+
+
+def _unpack_phone(packed: int, strings: list) -> str:
+    if packed & STRING_PHONE:
+        return strings[packed & ~STRING_PHONE]
+    return str(packed)
@@ -1,12 +1,22 @@
 from pathlib import Path
 
+from storage.binary_storage import BinaryStorage
 from storage.json_storage import JSONStorage
+from storage.jsonl_storage import JSONLinesStorage
+from storage.mmap_storage import MappedStorage
 from storage.pickle_storage import PickleStorage
+from storage.sqlite_storage import SQLiteStorage
 from storage.storage_interface import StorageInterface
+from storage.wal_storage import WALStorage
 
 STORAGE_TYPES = {
     "pkl": PickleStorage,
     "json": JSONStorage,
+    "jsonl": JSONLinesStorage,
+    "bin": BinaryStorage,
+    "mmap": MappedStorage,
+    "wal": WALStorage,
+    "sqlite": SQLiteStorage,
 }
 
 
@@ -1,5 +1,14 @@
 import json
 from datetime import datetime
+from models.address import Address
+from models.birthday import Birthday
+from models.contact import Record
+from models.email import Email
+from models.name import Name
+from models.note import Note
+from models.phone import Phone
+from repositories.contact_repository import ContactRepository
+from storage.atomic_file import atomic_write
 from storage.storage_interface import StorageInterface
 from storage.storage_error_decorators import handle_save_errors, handle_load_errors
 
@@ -16,7 +25,7 @@ class JSONStorage(StorageInterface):
     def save(self, data: object) -> bool:
         data_dict = self._serialize(data)
 
-        with open(self.file_path, "w", encoding="utf-8") as f:
+        with atomic_write(self.file_path, "w", encoding="utf-8") as f:
             json.dump(data_dict, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
         return True
 
@@ -24,22 +33,23 @@ class JSONStorage(StorageInterface):
     def load(self):
         with open(self.file_path, "r", encoding="utf-8") as f:
             data = json.load(f)
-            return self._deserialize(data)
-
-    def _serialize(self, obj) -> dict:
-        if hasattr(obj, "__dict__"):
-            result = {}
-            for key, value in obj.__dict__.items():
-                if isinstance(value, list):
-                    result[key] = [self._serialize(item) for item in value]
-                elif isinstance(value, dict):
-                    result[key] = {k: self._serialize(v) for k, v in value.items()}
-                elif hasattr(value, "__dict__"):
-                    result[key] = self._serialize(value)
-                else:
-                    result[key] = value
-            return result
-        return obj
+            return self._restore_repository(self._deserialize(data))
+
+    def _serialize(self, obj):
+        if isinstance(obj, list):
+            return [self._serialize(item) for item in obj]
+        if isinstance(obj, dict):
+            return {k: self._serialize(v) for k, v in obj.items()}
+        state = self._state(obj)
+        return obj if state is None else self._serialize(state)
+
+    @staticmethod
+    def _state(obj):
+        # Honour __getstate__ so objects can leave derived data (indexes) out
+        # and slotted models, which have no __dict__, still serialize
+        getstate = getattr(obj, "__getstate__", None)
+        state = getstate() if getstate else None
+        return state if isinstance(state, dict) else getattr(obj, "__dict__", None)
 
     def _deserialize(self, data):
         if isinstance(data, dict):
@@ -47,3 +57,36 @@ class JSONStorage(StorageInterface):
         elif isinstance(data, list):
             return [self._deserialize(item) for item in data]
         return data
+
+    @staticmethod
+    def _restore_repository(data):
+        """Rebuild the ContactRepository that _serialize turned into data.
+
+        Fields were written as their {"_value": ...} state and notes as the
+        _notes mapping (a "notes" list in files saved before notes had ids).
+        """
+        if not isinstance(data, dict) or "contacts" not in data:
+            return data
+        repository = ContactRepository()
+        repository.add_contacts(
+            JSONStorage._restore_record(state) for state in data["contacts"].values()
+        )
+        notes = data["_notes"].values() if "_notes" in data else data.get("notes", [])
+        for note in notes:
+            repository.add_note(Note.from_dict(note))
+        return repository
+
+    @staticmethod
+    def _restore_record(state: dict) -> Record:
+        record = Record.__new__(Record)
+        record.name = Name.restore(state["name"]["_value"])
+        record.phones = [Phone.restore(p["_value"]) for p in state["phones"]]
+        record.emails = [Email.restore(e["_value"]) for e in state["emails"]]
+        address, birthday = state["address"], state["birthday"]
+        record.address = Address.restore(address["_value"]) if address else None
+        record.birthday = (
+            Birthday.restore(datetime.fromisoformat(birthday["_value"]))
+            if birthday
+            else None
+        )
+        return record
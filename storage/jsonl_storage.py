@@ -0,0 +1,48 @@
+import json
+
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from storage.atomic_file import atomic_write
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+
+class JSONLinesStorage(StorageInterface):
+    """JSON Lines storage: one contact or note object per line.
+
+    Save writes each record as soon as it is serialized and load rebuilds
+    each Record/Note as its line is parsed, so memory use does not depend on
+    the size of the file.
+    """
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        with atomic_write(self.file_path, "w", encoding="utf-8") as f:
+            for record in data.contacts.values():
+                self._write_line(f, "contact", record.to_dict())
+            for note in data.notes:
+                self._write_line(f, "note", note.to_dict())
+        return True
+
+    @handle_load_errors
+    def load(self) -> object:
+        repository = ContactRepository()
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                kind = item.pop("type")
+                if kind == "contact":
+                    repository.add_contact(Record.from_dict(item, trusted=True))
+                elif kind == "note":
+                    repository.add_note(Note.from_dict(item))
+                else:
+                    raise ValueError(f"Unknown item type: {kind}")
+        return repository
+
+    @staticmethod
+    def _write_line(f, kind: str, item: dict):
+        f.write(json.dumps({"type": kind, **item}, ensure_ascii=False))
+        f.write("\n")
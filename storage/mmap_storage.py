@@ -0,0 +1,329 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+from datetime import datetime
+
+from models.address import Address
+from models.birthday import Birthday
+from models.contact import Record
+from models.email import Email
+from models.note import Note
+from models.phone import Phone
+from repositories.contact_repository import ContactRepository
+from storage.atomic_file import atomic_write
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+MAGIC = b"AB3M"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHI")
+OFFSET = struct.Struct("<Q")
+SLOT = struct.Struct("<I")
+NAME_SIZE = struct.Struct("<I")
+BIRTHDAY = struct.Struct("<I")
+
+
+class MappedStorage(StorageInterface):
+    """Memory-mapped address book whose contacts are decoded on demand.
+
+    Layout (little-endian), version 2:
+
+        header     magic "AB3M", u16 version, u16 reserved, u32 contact count
+        offsets    u64 file offset of every contact in insertion order,
+                   plus one more marking the start of the notes
+        by name    u32 contact slots sorted by UTF-8 name bytes
+        birthdays  u32 birthday date ordinal of every contact in insertion
+                   order, 0 if none (absent in version 1)
+        contacts   u32 name size, UTF-8 name,
+                   JSON [phones, emails, address, birthday date ordinal]
+        notes      JSON list of {"text", "tags", "id"}
+
+    Load maps the file and checks the header only: find_contact binary
+    searches the name table and decodes the one contact it lands on, and
+    iterating decodes contacts as it reaches them. The birthday indexes
+    are built from the birthday column without decoding any contact.
+    """
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        # The new file is renamed over the old one, which stays mapped: the
+        # loaded contacts keep reading it until nothing refers to them
+        content = encode_repository(data)
+        with atomic_write(self.file_path, "wb") as f:
+            f.write(content)
+        return True
+
+    @handle_load_errors
+    def load(self) -> object:
+        buffer = map_file(self.file_path)
+        try:
+            contacts = MappedContacts(buffer)
+            notes = json.loads(buffer[contacts.notes_offset :].decode("utf-8"))
+        except BaseException:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+            raise
+
+        repository = MappedContactRepository()
+        repository.contacts = contacts
+        repository.notes = [Note.from_dict(note) for note in notes]
+        return repository
+
+
+def map_file(path):
+    """Read-only buffer of the file at path: an mmap, or bytes on Windows.
+
+    A mapping outlives the file being replaced and is unmapped when the
+    last reference goes. Windows can't replace a file that is mapped, so
+    there the file is read instead; contacts are still decoded on demand.
+    """
+    with open(path, "rb") as f:
+        if os.name == "nt":
+            return f.read()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MappedContactRepository(ContactRepository):
+    """ContactRepository whose contacts were loaded by MappedStorage.
+
+    While the contacts are still mapped, birthday index builds read the
+    birthday column of the file instead of decoding every contact.
+    """
+
+    def _contact_birthdays(self):
+        if isinstance(self.contacts, MappedContacts):
+            return self.contacts.birthdays()
+        return super()._contact_birthdays()
+
+
+class MappedContacts(MutableMapping):
+    """name -> Record mapping backed by a mapped MappedStorage file.
+
+    Decoded records are cached, so edits made by the command handlers are
+    kept. Added, replaced and deleted contacts are tracked on top of the
+    file, which is never written through; pickling yields a plain dict.
+    """
+
+    def __init__(self, buffer):
+        magic, version, _, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a memory-mapped address book file")
+        if version not in (1, FORMAT_VERSION):
+            raise ValueError(f"Unsupported mapped format version: {version}")
+
+        self._buffer = buffer
+        self._count = count
+        self._offsets_start = HEADER.size
+        self._order_start = self._offsets_start + (count + 1) * OFFSET.size
+        self._birthdays_start = None
+        end = self._order_start + count * SLOT.size
+        if version >= 2:
+            self._birthdays_start = end
+            end += count * BIRTHDAY.size
+        if end > len(buffer):
+            raise ValueError("Mapped file is truncated")
+        self.notes_offset = self._offset(count)
+        if self.notes_offset > len(buffer):
+            raise ValueError("Mapped file is truncated")
+
+        # Decoded or replaced contacts stored in the file
+        self._records = {}
+        # Names of file contacts deleted in this session
+        self._deleted = set()
+        # Contacts added in this session, in insertion order
+        self._added = {}
+
+    def __reduce__(self):
+        return dict, (list(self.items()),)
+
+    def __getitem__(self, name):
+        record = self._added.get(name)
+        if record is None:
+            record = self._records.get(name)
+        if record is not None:
+            return record
+        if name not in self._deleted:
+            slot = self._find_slot(name)
+            if slot is not None:
+                return self._record(slot, name)
+        raise KeyError(name)
+
+    def __setitem__(self, name, record):
+        if name not in self._added and self._in_file(name):
+            self._records[name] = record
+        else:
+            self._added[name] = record
+
+    def __delitem__(self, name):
+        if name in self._added:
+            del self._added[name]
+        elif self._in_file(name):
+            self._deleted.add(name)
+            self._records.pop(name, None)
+        else:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in self._added or self._in_file(name)
+
+    def __iter__(self):
+        for slot in range(self._count):
+            name = self._name(slot)
+            if name not in self._deleted:
+                yield name
+        yield from list(self._added)
+
+    def __len__(self):
+        return self._count - len(self._deleted) + len(self._added)
+
+    def items(self):
+        for slot in range(self._count):
+            name = self._name(slot)
+            if name not in self._deleted:
+                record = self._records.get(name)
+                if record is None:
+                    record = self._record(slot, name)
+                yield name, record
+        yield from list(self._added.items())
+
+    def values(self):
+        for _, record in self.items():
+            yield record
+
+    def copy(self) -> "MappedContacts":
+        """Mapping over the same file with its own copy of the changes"""
+        contacts = MappedContacts.__new__(MappedContacts)
+        contacts.__dict__.update(self.__dict__)
+        contacts._records = self._records.copy()
+        contacts._deleted = self._deleted.copy()
+        contacts._added = self._added.copy()
+        return contacts
+
+    def birthdays(self):
+        """Yield (name, birthday datetime) of every contact that has one.
+
+        Contacts still as in the file are read from the birthday column;
+        version 1 files have none, so their contacts are decoded.
+        """
+        if self._birthdays_start is None:
+            for name, record in self.items():
+                if record.birthday:
+                    yield name, record.birthday.value
+            return
+
+        ordinals = struct.unpack_from(
+            f"<{self._count}I", self._buffer, self._birthdays_start
+        )
+        for slot, ordinal in enumerate(ordinals):
+            name = self._name(slot)
+            if name in self._deleted:
+                continue
+            record = self._records.get(name)
+            if record is not None:
+                # Decoded, so possibly edited or replaced
+                if record.birthday:
+                    yield name, record.birthday.value
+            elif ordinal:
+                yield name, datetime.fromordinal(ordinal)
+        for name, record in list(self._added.items()):
+            if record.birthday:
+                yield name, record.birthday.value
+
+    def _in_file(self, name) -> bool:
+        if name in self._deleted:
+            return False
+        return name in self._records or self._find_slot(name) is not None
+
+    def _offset(self, slot: int) -> int:
+        position = self._offsets_start + slot * OFFSET.size
+        return OFFSET.unpack_from(self._buffer, position)[0]
+
+    def _name_bytes(self, slot: int) -> bytes:
+        offset = self._offset(slot)
+        (size,) = NAME_SIZE.unpack_from(self._buffer, offset)
+        start = offset + NAME_SIZE.size
+        return self._buffer[start : start + size]
+
+    def _name(self, slot: int) -> str:
+        return self._name_bytes(slot).decode("utf-8")
+
+    def _find_slot(self, name: str):
+        """Binary search of the by-name table; None if name isn't in the file"""
+        key = name.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            (slot,) = SLOT.unpack_from(
+                self._buffer, self._order_start + middle * SLOT.size
+            )
+            found = self._name_bytes(slot)
+            if found == key:
+                return slot
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _record(self, slot: int, name: str) -> Record:
+        start = self._offset(slot) + NAME_SIZE.size + len(name.encode("utf-8"))
+        phones, emails, address, birthday = json.loads(
+            self._buffer[start : self._offset(slot + 1)].decode("utf-8")
+        )
+
+        record = Record(name)
+        record.phones = [Phone.restore(p) for p in phones]
+        record.emails = [Email.restore(e) for e in emails]
+        if address is not None:
+            record.address = Address.restore(address)
+        if birthday:
+            record.birthday = Birthday.restore(datetime.fromordinal(birthday))
+        self._records[name] = record
+        return record
+
+
+def encode_repository(repository) -> bytes:
+    records = []
+    birthdays = []
+    for record in repository.contacts.values():
+        name = record.name.value.encode("utf-8")
+        birthday = record.birthday.value.toordinal() if record.birthday else 0
+        birthdays.append(BIRTHDAY.pack(birthday))
+        fields = json.dumps(
+            [
+                [p.value for p in record.phones],
+                [e.value for e in record.emails],
+                record.address.value if record.address else None,
+                birthday,
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        records.append((name, NAME_SIZE.pack(len(name)) + name + fields))
+
+    count = len(records)
+    offset = HEADER.size + (count + 1) * OFFSET.size
+    offset += count * (SLOT.size + BIRTHDAY.size)
+    offsets = []
+    for _, content in records:
+        offsets.append(OFFSET.pack(offset))
+        offset += len(content)
+    offsets.append(OFFSET.pack(offset))
+
+    order = sorted(range(count), key=lambda slot: records[slot][0])
+    notes = json.dumps(
+        [note.to_dict() for note in repository.notes], ensure_ascii=False
+    ).encode("utf-8")
+
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, FORMAT_VERSION, 0, count),
+            *offsets,
+            *(SLOT.pack(slot) for slot in order),
+            *birthdays,
+            *(content for _, content in records),
+            notes,
+        ]
+    )
@@ -1,5 +1,6 @@
 import pickle
 
+from storage.atomic_file import atomic_write
 from storage.storage_error_decorators import handle_load_errors, handle_save_errors
 from storage.storage_interface import StorageInterface
 
@@ -7,7 +8,7 @@ from storage.storage_interface import StorageInterface
 class PickleStorage(StorageInterface):
     @handle_save_errors
     def save(self, data: object) -> bool:
-        with open(self.file_path, "wb") as f:
+        with atomic_write(self.file_path, "wb") as f:
             pickle.dump(data, f)
         return True
 
@@ -0,0 +1,40 @@
+import sqlite3
+
+from repositories.contact_repository import ContactRepository
+from repositories.sqlite_contact_repository import SQLiteContactRepository
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+
+class SQLiteStorage(StorageInterface):
+    """Storage whose repository reads and writes an SQLite database directly.
+
+    Loading only opens the database: contacts are materialized on demand and
+    every change is committed as it happens, so save has nothing left to write
+    for its own repository.
+    """
+
+    writes_through = True
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        if isinstance(data, SQLiteContactRepository):
+            data.commit()
+        elif isinstance(data, ContactRepository):
+            repository = self._connect()
+            try:
+                repository.import_repository(data)
+            finally:
+                repository.close()
+        else:
+            raise TypeError(f"Can't store {type(data).__name__} in SQLite")
+        return True
+
+    @handle_load_errors
+    def load(self) -> object:
+        return self._connect()
+
+    def _connect(self) -> SQLiteContactRepository:
+        connection = sqlite3.connect(self.file_path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        return SQLiteContactRepository(connection)
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from storage.atomic_file import backup_paths
+
 
 class StorageInterface(ABC):
+    # True when every mutation is persisted as it happens (no periodic saves)
+    writes_through = False
+
     def __init__(self, file_path: Path):
         self.file_path = file_path
 
@@ -15,3 +20,22 @@ class StorageInterface(ABC):
     def load(self) -> object:
         """Load data from file."""
         pass
+
+    def load_latest_valid(self) -> object:
+        """Load data, falling back to the newest backup that can be read."""
+        data = self.load()
+        if data is not None:
+            return data
+
+        for backup_path in backup_paths(self.file_path):
+            if not backup_path.exists():
+                continue
+            data = type(self)(backup_path).load()
+            if data is not None:
+                print(f"Restored data from backup {backup_path}")
+                return data
+        return None
+
+    def attach(self, repository) -> None:
+        """Hook called with the repository used for the session."""
+        pass
@@ -0,0 +1,186 @@
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from storage.atomic_file import atomic_write
+from storage.storage_error_decorators import handle_load_errors, handle_save_errors
+from storage.storage_interface import StorageInterface
+
+# Log entries after which the log is folded into a new snapshot
+COMPACT_EVERY = 500
+
+
+class WALStorage(StorageInterface):
+    """Pickle snapshot plus an append-only log of the mutations made since.
+
+    Every repository mutation is appended to the log and fsynced before the
+    command returns, so a crash loses at most the command in progress; a
+    bulk add is one entry and one fsync. Once COMPACT_EVERY entries piled
+    up, a background thread pickles a snapshot of the repository, writes it
+    and trims the log to the entries it does not cover.
+    """
+
+    writes_through = True
+
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        self.snapshot_path = file_path.with_suffix(".snapshot")
+        self._lock = threading.Lock()
+        self._log = None
+        self._repository = None
+        self._sequence = 0
+        self._pending = 0
+        self._compaction = None
+
+    @handle_save_errors
+    def save(self, data: object) -> bool:
+        self._wait_for_compaction()
+        with self._lock:
+            sequence = self._sequence
+        self._compact(sequence, pickle.dumps((sequence, data)))
+        self._pending = 0
+        return True
+
+    @handle_load_errors
+    def load(self) -> object:
+        if not self.snapshot_path.exists() and not self.file_path.exists():
+            raise FileNotFoundError(self.file_path)
+
+        repository = ContactRepository()
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "rb") as f:
+                self._sequence, repository = pickle.load(f)
+
+        if self.file_path.exists():
+            self._replay(repository)
+        return repository
+
+    def attach(self, repository) -> None:
+        """Log every further mutation of repository"""
+        self._repository = repository
+        self._log = open(self.file_path, "ab")
+        repository.subscribe(self._append)
+
+    def _append(self, event: str, *payload):
+        entry = self._encode(event, payload)
+        with self._lock:
+            self._sequence += 1
+            entry["seq"] = self._sequence
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+            self._log.write(line.encode("utf-8"))
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+        self._pending += 1
+        if self._pending >= COMPACT_EVERY and not self._compacting():
+            self._start_compaction()
+
+    @staticmethod
+    def _encode(event: str, payload: tuple) -> dict:
+        if event == "put_contact":
+            return {"op": event, "contact": payload[0].to_dict()}
+        if event == "put_contacts":
+            return {"op": event, "contacts": [r.to_dict() for r in payload[0]]}
+        if event == "delete_contact":
+            return {"op": event, "name": payload[0]}
+        if event == "add_note":
+            return {"op": event, "note": payload[0].to_dict()}
+        if event == "edit_note":
+            return {"op": event, "id": payload[0], "note": payload[1].to_dict()}
+        if event == "delete_note":
+            return {"op": event, "id": payload[0]}
+        raise ValueError(f"Unknown repository event: {event}")
+
+    def _replay(self, repository):
+        """Apply log entries newer than the snapshot, dropping a torn tail"""
+        valid_size = 0
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                valid_size += len(line)
+                if entry["seq"] > self._sequence:
+                    self._apply(repository, entry)
+                    self._sequence = entry["seq"]
+
+        # A crash in the middle of an append leaves a partial last line
+        if valid_size != self.file_path.stat().st_size:
+            with open(self.file_path, "r+b") as f:
+                f.truncate(valid_size)
+
+    @staticmethod
+    def _apply(repository, entry: dict):
+        op = entry["op"]
+        if op == "put_contact":
+            repository.add_contact(Record.from_dict(entry["contact"], trusted=True))
+        elif op == "put_contacts":
+            repository.add_contacts(
+                Record.from_dict(contact, trusted=True) for contact in entry["contacts"]
+            )
+        elif op == "delete_contact":
+            repository.delete_contact(entry["name"])
+        elif op == "add_note":
+            repository.add_note(Note.from_dict(entry["note"]))
+        elif op == "edit_note":
+            note = repository.get_note(entry["id"])
+            repository.edit_note(note, entry["note"]["text"], entry["note"]["tags"])
+        elif op == "delete_note":
+            repository.del_note(repository.get_note(entry["id"]))
+        else:
+            raise ValueError(f"Unknown log entry: {op}")
+
+    def _compacting(self) -> bool:
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def _start_compaction(self):
+        # The snapshot is taken on the caller's thread, as of this sequence;
+        # pickling it, the slow part, happens in the background
+        with self._lock:
+            sequence = self._sequence
+        snapshot = self._repository.snapshot()
+        self._pending = 0
+        self._compaction = threading.Thread(
+            target=self._compact_in_background, args=(sequence, snapshot), daemon=True
+        )
+        self._compaction.start()
+
+    def _wait_for_compaction(self):
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def _compact_in_background(self, sequence: int, snapshot):
+        try:
+            self._compact(sequence, pickle.dumps((sequence, snapshot)))
+        except (IOError, OSError) as e:
+            print(f"Can't compact {self.file_path}: {e}")
+
+    def _compact(self, sequence: int, snapshot: bytes):
+        """Write snapshot, then keep only the log entries it does not cover"""
+        self._write_durably(self.snapshot_path, snapshot)
+
+        with self._lock:
+            kept = []
+            if self.file_path.exists():
+                with open(self.file_path, "rb") as f:
+                    kept = [line for line in f if json.loads(line)["seq"] > sequence]
+            self._write_durably(self.file_path, b"".join(kept))
+
+            if self._log is not None:
+                self._log.close()
+                self._log = open(self.file_path, "ab")
+
+    @staticmethod
+    def _write_durably(path: Path, content: bytes):
+        # The log itself is the history: no rotated backups needed
+        with atomic_write(path, "wb", backups=0) as f:
+            f.write(content)
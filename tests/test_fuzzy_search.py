@@ -0,0 +1,69 @@
+import difflib
+import random
+
+import pytest
+
+from benchmarks.data_generator import generate_repository
+from search.search_index import overlap_bound, query_ngram_list
+from search.search_service import FUZZY_THRESHOLD, SearchService
+
+QUERIES = [
+    "3805",
+    "380",
+    "olena",
+    "olean shevcenko",
+    "kovalenko 12",
+    "user12@example",
+    "kyiv, sadova",
+    "12.03.1980",
+    "zzzzzz",
+]
+
+
+def brute_force(contacts, query, limit=5):
+    """Reference fuzzy search: score every contact, stable sort, threshold"""
+    service = SearchService()
+    query = query.lower()
+    scored = []
+    for record in contacts.values():
+        scores = [
+            difflib.SequenceMatcher(None, query, field).ratio()
+            for field in service.collect_fields(record)
+        ]
+        best = max(scores, default=0.0)
+        if best >= FUZZY_THRESHOLD:
+            scored.append((best, record))
+    scored.sort(key=lambda item: -item[0])
+    return [record for _, record in scored[:limit]]
+
+
+@pytest.fixture(scope="module")
+def repository():
+    return generate_repository(3000)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_pruned_search_matches_full_scan(repository, query):
+    expected = brute_force(repository.contacts, query)
+    results = repository.search_closest_contacts(query)
+    assert [r.name.value for r in results] == [r.name.value for r in expected]
+
+
+@pytest.mark.parametrize("limit", [1, 3, 20])
+def test_pruned_search_keeps_insertion_order_on_ties(repository, limit):
+    # "380" is in every phone: thousands of contacts tie on the overlap count
+    expected = brute_force(repository.contacts, "3805", limit)
+    results = SearchService().fuzzy_search(
+        repository.contacts, "3805", limit, index=repository.search_index
+    )
+    assert results == expected
+
+
+def test_overlap_bound_is_never_below_the_ratio():
+    rng = random.Random(2)
+    for _ in range(3000):
+        query = "".join(rng.choice("abc") for _ in range(rng.randrange(3, 9)))
+        field = "".join(rng.choice("abc") for _ in range(rng.randrange(1, 12)))
+        shared = sum(gram in field for gram in query_ngram_list(query))
+        ratio = difflib.SequenceMatcher(None, query, field).ratio()
+        assert ratio <= overlap_bound(len(query), shared) + 1e-9
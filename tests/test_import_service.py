@@ -0,0 +1,56 @@
+import pytest
+
+from handlers.import_service import ImportService
+from models.contact import Record
+from repositories.contact_repository import ContactRepository
+
+
+def write_csv(path, *rows):
+    path.write_text("\n".join(["name,phone,email,address", *rows]) + "\n")
+    return path
+
+
+@pytest.fixture
+def repository():
+    repository = ContactRepository()
+    record = Record("Ivan")
+    record.add_phone("0501234567")
+    repository.add_contact(record)
+    return repository
+
+
+def test_merges_into_known_contacts_and_adds_new_ones(repository, tmp_path):
+    path = write_csv(
+        tmp_path / "book.csv",
+        "Ivan,0507654321,ivan@example.com,Kyiv",
+        "Olena,0671234567,,",
+    )
+    report = ImportService(repository, workers=0).import_file(path)
+
+    assert (report.added, report.merged, report.rejected) == (1, 1, 0)
+    ivan = repository.find_contact("Ivan")
+    assert [p.value for p in ivan.phones] == ["0501234567", "0507654321"]
+    assert [e.value for e in ivan.emails] == ["ivan@example.com"]
+    assert ivan.address.value == "Kyiv"
+    assert repository.find_by_phone("0507654321") == [ivan]
+    assert repository.find_contact("Olena") is not None
+
+
+def test_failed_batch_leaves_stored_contacts_untouched(repository, tmp_path, monkeypatch):
+    stored = repository.find_contact("Ivan")
+    events = []
+    repository.subscribe(lambda event, payload: events.append(event))
+
+    def fail(records):
+        list(records)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repository, "add_contacts", fail)
+    path = write_csv(tmp_path / "book.csv", "Ivan,0507654321,ivan@example.com,Kyiv")
+    with pytest.raises(OSError):
+        ImportService(repository, workers=0).import_file(path)
+
+    assert repository.find_contact("Ivan") is stored
+    assert [p.value for p in stored.phones] == ["0501234567"]
+    assert stored.emails == [] and stored.address is None
+    assert events == []
@@ -0,0 +1,91 @@
+import struct
+
+from benchmarks.data_generator import generate_repository
+from models.contact import Record
+from storage.mmap_storage import (
+    BIRTHDAY,
+    HEADER,
+    OFFSET,
+    SLOT,
+    MappedContacts,
+    MappedStorage,
+    encode_repository,
+)
+
+
+def contact_dicts(repository):
+    return [record.to_dict() for record in repository.contacts.values()]
+
+
+def test_round_trip(tmp_path):
+    repository = generate_repository(300, notes=20)
+    storage = MappedStorage(tmp_path / "book.mmap")
+    assert storage.save(repository)
+
+    loaded = storage.load()
+    assert isinstance(loaded.contacts, MappedContacts)
+    assert contact_dicts(loaded) == contact_dicts(repository)
+    assert [n.to_dict() for n in loaded.notes] == [n.to_dict() for n in repository.notes]
+
+
+def test_birthday_index_decodes_no_contact(tmp_path):
+    repository = generate_repository(300)
+    storage = MappedStorage(tmp_path / "book.mmap")
+    storage.save(repository)
+
+    loaded = storage.load()
+    assert dict(loaded._contact_birthdays()) == dict(repository._contact_birthdays())
+    assert not loaded.contacts._records
+
+
+def test_version_1_file_still_loads(tmp_path):
+    repository = generate_repository(50)
+    content = encode_repository(repository)
+    count = len(repository.contacts)
+    # Drop the birthday column and shift every offset back by its size
+    column_start = HEADER.size + (count + 1) * OFFSET.size + count * SLOT.size
+    column_size = count * BIRTHDAY.size
+    offsets = struct.unpack_from(f"<{count + 1}Q", content, HEADER.size)
+    old = bytearray(content[:column_start] + content[column_start + column_size :])
+    struct.pack_into("<H", old, 4, 1)
+    struct.pack_into(
+        f"<{count + 1}Q", old, HEADER.size, *(o - column_size for o in offsets)
+    )
+    path = tmp_path / "book.mmap"
+    path.write_bytes(bytes(old))
+
+    loaded = MappedStorage(path).load()
+    assert contact_dicts(loaded) == contact_dicts(repository)
+    assert dict(loaded._contact_birthdays()) == dict(repository._contact_birthdays())
+
+
+def test_save_keeps_readers_of_the_old_file_working(tmp_path):
+    storage = MappedStorage(tmp_path / "book.mmap")
+    storage.save(generate_repository(200))
+    loaded = storage.load()
+    storage.attach(loaded)
+
+    reader = loaded.iter_contacts()
+    first = [next(reader).name.value for _ in range(10)]
+    loaded.add_contact(Record("Added Later"))
+    assert storage.save(loaded.snapshot())
+    assert storage.save(loaded.snapshot())
+
+    rest = [record.name.value for record in reader]
+    assert len(first) + len(rest) == 201
+    # Still served from the mapping, not decoded into a dict by the save
+    assert isinstance(loaded.contacts, MappedContacts)
+    assert loaded.find_contact("Added Later") is not None
+    assert len(storage.load().contacts) == 201
+
+
+def test_corrupted_file_falls_back_to_backup(tmp_path):
+    storage = MappedStorage(tmp_path / "book.mmap")
+    repository = generate_repository(20)
+    storage.save(repository)
+    storage.save(repository)
+    storage.file_path.write_bytes(b"garbage")
+
+    assert storage.load() is None
+    restored = storage.load_latest_valid()
+    assert contact_dicts(restored) == contact_dicts(repository)
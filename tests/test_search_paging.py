@@ -0,0 +1,69 @@
+import pytest
+
+import cli.presenter
+from benchmarks.data_generator import generate_repository
+from cli.presenter import Presenter
+from handlers.command_handler import CommandHandler
+from storage.sqlite_storage import SQLiteStorage
+
+QUERY = "an"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request, tmp_path):
+    repository = generate_repository(400)
+    if request.param == "memory":
+        yield repository
+        return
+    storage = SQLiteStorage(tmp_path / "book.sqlite")
+    storage.save(repository)
+    repository = storage.load()
+    yield repository
+    repository.close()
+
+
+def names(records):
+    return [record.name.value for record in records]
+
+
+def test_pages_cover_the_search_results(repository):
+    expected = names(repository.search_contacts(QUERY))
+    assert len(expected) > 30
+
+    pages = []
+    for offset in range(0, len(expected), 30):
+        total, page = repository.search_contacts_page(QUERY, offset, 30)
+        assert total == len(expected)
+        pages.extend(names(page))
+    assert pages == expected
+    assert repository.search_contacts_page(QUERY, len(expected), 30)[1] == []
+
+
+def test_page_searches_the_index_once():
+    repository = generate_repository(200)
+    index = repository.search_index
+    calls = []
+    search = index.search
+    index.search = lambda query: calls.append(query) or search(query)
+
+    total, page = repository.search_contacts_page(QUERY, 5, 10)
+    assert calls == [QUERY]
+    assert len(page) == 10 and total > 15
+
+
+def test_handler_shows_limit_contacts_per_page(repository, capsys):
+    CommandHandler(repository).search_contacts(QUERY, "--limit", "7", "--page", "2")
+    out = capsys.readouterr().out
+    assert out.count("Phones:") == 7
+    assert "Contacts 8-14 of" in out
+
+
+def test_table_writes_render_batch_contacts_at_a_time(monkeypatch, capsys):
+    monkeypatch.setattr(cli.presenter, "RENDER_BATCH", 3)
+    writes = []
+    monkeypatch.setattr(
+        cli.presenter.sys.stdout, "write", lambda text: writes.append(text)
+    )
+    Presenter.print_contacts_table(generate_repository(7).iter_contacts())
+
+    assert [w.count("Phones:") for w in writes] == [3, 3, 1]
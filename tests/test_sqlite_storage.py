@@ -0,0 +1,119 @@
+import sqlite3
+
+import pytest
+
+from benchmarks.data_generator import generate_repository
+from handlers.errors import ValidationError
+from models.contact import Record
+from repositories.contact_repository import ContactRepository
+from repositories.sqlite_contact_repository import SQLiteContactRepository
+from storage.pickle_storage import PickleStorage
+from storage.sqlite_storage import SQLiteStorage
+
+
+def contact_dicts(repository):
+    return [record.to_dict() for record in repository.contacts.values()]
+
+
+def note_dicts(repository):
+    return [note.to_dict() for note in repository.notes]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteStorage(tmp_path / "book.sqlite")
+
+
+def test_round_trip(storage):
+    repository = generate_repository(200, notes=20)
+    assert storage.save(repository)
+
+    loaded = storage.load()
+    assert isinstance(loaded, SQLiteContactRepository)
+    assert contact_dicts(loaded) == contact_dicts(repository)
+    assert note_dicts(loaded) == note_dicts(repository)
+    loaded.close()
+
+
+def test_changes_are_committed_as_they_happen(storage):
+    repository = storage.load()
+    record = Record("Olena")
+    record.add_phone("380501234567")
+    repository.add_contact(record)
+    repository.delete_contact("Missing")
+    repository.close()
+
+    loaded = storage.load()
+    assert loaded.find_contact("olena").phones[0].value == "380501234567"
+    loaded.close()
+
+
+def test_saving_another_repository_closes_its_connection(storage, monkeypatch):
+    closed = []
+    monkeypatch.setattr(
+        SQLiteContactRepository, "close", lambda self: closed.append(self)
+    )
+    assert storage.save(generate_repository(5))
+    assert len(closed) == 1
+
+
+def test_email_duplicates_ignore_case_beyond_ascii(storage):
+    repository = storage.load()
+    record = Record("Jürgen")
+    record.add_email("Ärger@example.com")
+    repository.add_contact(record)
+
+    assert repository.find_by_email("ärger@EXAMPLE.com") == [record]
+    with pytest.raises(ValidationError):
+        repository.ensure_unique_email("äRGER@example.com", "Someone Else")
+    memory = ContactRepository()
+    memory.add_contact(record)
+    with pytest.raises(ValidationError):
+        memory.ensure_unique_email("äRGER@example.com", "Someone Else")
+    repository.close()
+
+
+def test_old_database_gets_key_columns(storage):
+    connection = sqlite3.connect(storage.file_path)
+    connection.executescript(
+        """
+        CREATE TABLE contacts (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, address TEXT,
+            birthday TEXT, birth_month INTEGER, birth_day INTEGER,
+            search_text TEXT NOT NULL
+        );
+        CREATE TABLE phones (contact_id INTEGER, position INTEGER, phone TEXT);
+        CREATE TABLE emails (contact_id INTEGER, position INTEGER, email TEXT);
+        INSERT INTO contacts (id, name, search_text) VALUES (1, 'Ivan', 'ivan');
+        INSERT INTO phones VALUES (1, 0, '0501234567');
+        INSERT INTO emails VALUES (1, 0, 'Ärger@example.com');
+        """
+    )
+    connection.commit()
+    connection.close()
+
+    repository = storage.load()
+    assert [r.name.value for r in repository.find_by_phone("380501234567")] == ["Ivan"]
+    assert [r.name.value for r in repository.find_by_email("ärger@example.com")] == [
+        "Ivan"
+    ]
+    assert repository.find_contact("IVAN").name.value == "Ivan"
+    repository.close()
+
+
+def test_snapshot_can_be_saved_elsewhere(storage, tmp_path):
+    storage.save(generate_repository(50, notes=5))
+    repository = storage.load()
+
+    snapshot = repository.snapshot()
+    pickled = PickleStorage(tmp_path / "book.pkl")
+    assert pickled.save(snapshot)
+    loaded = pickled.load()
+    assert contact_dicts(loaded) == contact_dicts(repository)
+    assert note_dicts(loaded) == note_dicts(repository)
+    repository.close()
+
+
+def test_corrupted_database_loads_as_none(storage):
+    storage.file_path.write_bytes(b"not a database" * 100)
+    assert storage.load() is None
@@ -0,0 +1,175 @@
+import pytest
+
+from benchmarks.data_generator import generate_repository
+from models.contact import Record
+from models.note import Note
+from repositories.contact_repository import ContactRepository
+from storage.atomic_file import atomic_write, backup_paths
+from storage.binary_storage import BinaryStorage
+from storage.factory import StorageFactory
+from storage.jsonl_storage import JSONLinesStorage
+from storage.wal_storage import WALStorage
+
+SNAPSHOT_FORMATS = ["pkl", "json", "jsonl", "bin", "mmap"]
+
+
+def contact_dicts(repository):
+    return [record.to_dict() for record in repository.contacts.values()]
+
+
+def note_dicts(repository):
+    return [note.to_dict() for note in repository.notes]
+
+
+def assert_same_book(loaded, repository):
+    assert contact_dicts(loaded) == contact_dicts(repository)
+    assert note_dicts(loaded) == note_dicts(repository)
+
+
+@pytest.mark.parametrize("storage_type", SNAPSHOT_FORMATS)
+def test_round_trip(storage_type, tmp_path):
+    repository = generate_repository(300, notes=30)
+    storage = StorageFactory.create_storage(storage_type, tmp_path)
+    assert storage.save(repository)
+    assert_same_book(storage.load(), repository)
+
+
+@pytest.mark.parametrize("storage_type", SNAPSHOT_FORMATS)
+def test_missing_or_corrupted_file_loads_as_none(storage_type, tmp_path):
+    storage = StorageFactory.create_storage(storage_type, tmp_path)
+    assert storage.load() is None
+    storage.file_path.write_bytes(b"\x00garbage\xff" * 50)
+    assert storage.load() is None
+
+
+def test_binary_rejects_a_truncated_file(tmp_path):
+    storage = BinaryStorage(tmp_path / "book.bin")
+    storage.save(generate_repository(50, notes=5))
+    content = storage.file_path.read_bytes()
+    storage.file_path.write_bytes(content[: len(content) // 2])
+    assert storage.load() is None
+
+
+def test_binary_rejects_an_unknown_version(tmp_path):
+    storage = BinaryStorage(tmp_path / "book.bin")
+    storage.save(generate_repository(5))
+    content = bytearray(storage.file_path.read_bytes())
+    content[4:6] = (99).to_bytes(2, "little")
+    storage.file_path.write_bytes(bytes(content))
+    assert storage.load() is None
+
+
+def test_jsonl_rejects_an_unknown_line_type(tmp_path):
+    storage = JSONLinesStorage(tmp_path / "book.jsonl")
+    storage.save(generate_repository(5))
+    with open(storage.file_path, "a", encoding="utf-8") as f:
+        f.write('{"type": "group", "name": "friends"}\n')
+    assert storage.load() is None
+
+
+def make_changes(repository):
+    record = Record("Olena")
+    record.add_phone("0671234567")
+    repository.add_contact(record)
+    repository.add_contacts([Record("Petro"), Record("Maria")])
+    repository.delete_contact("Petro")
+    first, second = Note("buy milk", ["home"]), Note("call Olena")
+    repository.add_note(first)
+    repository.add_note(second)
+    repository.edit_note(first, "buy bread", ["home", "shop"])
+    repository.del_note(second)
+
+
+def test_wal_replays_the_log_over_the_snapshot(tmp_path):
+    storage = WALStorage(tmp_path / "book.wal")
+    repository = generate_repository(50, notes=5)
+    storage.save(repository)
+    storage.attach(repository)
+    make_changes(repository)
+
+    loaded = WALStorage(storage.file_path).load()
+    assert_same_book(loaded, repository)
+    assert loaded.find_contact("Petro") is None
+
+
+def test_wal_compaction_keeps_later_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr("storage.wal_storage.COMPACT_EVERY", 3)
+    storage = WALStorage(tmp_path / "book.wal")
+    repository = ContactRepository()
+    storage.attach(repository)
+    make_changes(repository)
+    storage._wait_for_compaction()
+
+    assert storage.snapshot_path.exists()
+    assert_same_book(WALStorage(storage.file_path).load(), repository)
+
+
+def test_wal_drops_a_torn_tail(tmp_path):
+    storage = WALStorage(tmp_path / "book.wal")
+    repository = ContactRepository()
+    storage.save(repository)
+    storage.attach(repository)
+    repository.add_contact(Record("Olena"))
+    intact = storage.file_path.stat().st_size
+    with open(storage.file_path, "ab") as f:
+        f.write(b'{"op": "put_contact", "contact": {"name": "Pet')
+
+    loaded = WALStorage(storage.file_path).load()
+    assert list(loaded.contacts) == ["Olena"]
+    assert storage.file_path.stat().st_size == intact
+
+
+def test_wal_rejects_an_unknown_entry(tmp_path):
+    storage = WALStorage(tmp_path / "book.wal")
+    storage.file_path.write_text('{"op": "rename_contact", "seq": 1}\n')
+    assert storage.load() is None
+
+
+def test_atomic_write_rotates_backups(tmp_path):
+    path = tmp_path / "book.bin"
+    for version in range(5):
+        with atomic_write(path, "w") as f:
+            f.write(f"version {version}")
+
+    assert path.read_text() == "version 4"
+    assert [p.read_text() for p in backup_paths(path)] == [
+        "version 3",
+        "version 2",
+        "version 1",
+    ]
+
+
+def test_failed_atomic_write_keeps_the_file_and_its_backups(tmp_path):
+    path = tmp_path / "book.bin"
+    for version in range(2):
+        with atomic_write(path, "w") as f:
+            f.write(f"version {version}")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path, "w") as f:
+            f.write("half written")
+            raise RuntimeError("crash")
+
+    assert path.read_text() == "version 1"
+    assert backup_paths(path)[0].read_text() == "version 0"
+    assert not backup_paths(path)[1].exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["book.bin", "book.bin.1"]
+
+
+@pytest.mark.parametrize("storage_type", ["pkl", "bin", "jsonl"])
+def test_load_latest_valid_falls_back_to_a_backup(storage_type, tmp_path):
+    storage = StorageFactory.create_storage(storage_type, tmp_path)
+    older = generate_repository(20, notes=2)
+    storage.save(older)
+    storage.save(generate_repository(30))
+    storage.file_path.write_bytes(b"\x00torn")
+
+    assert_same_book(storage.load_latest_valid(), older)
+
+
+def test_load_latest_valid_gives_up_when_nothing_loads(tmp_path):
+    storage = StorageFactory.create_storage("pkl", tmp_path)
+    assert storage.load_latest_valid() is None
+    storage.file_path.write_bytes(b"\x00torn")
+    backup_paths(storage.file_path)[0].write_bytes(b"\x00torn too")
+    assert storage.load_latest_valid() is None
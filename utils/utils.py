@@ -1,17 +1,33 @@
-import re
+from functools import lru_cache
+
 from handlers.errors import ValidationError
 
+# Phones whose normalized form is remembered; bulk loads, index updates and
+# uniqueness checks normalize the same numbers over and over
+PHONE_CACHE_SIZE = 65536
+
+
+class _DecimalDigits(dict):
+    """str.translate table keeping decimal digits (what re's \\d matches)"""
+
+    def __missing__(self, code):
+        char = chr(code)
+        kept = self[code] = char if char.isdecimal() else None
+        return kept
+
+
+DECIMAL_DIGITS = _DecimalDigits()
+
 
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
 def normalize_phone(phone_number: str):
     if not bool(phone_number.strip()):
         raise ValidationError("phone", "Phone number is empty")
 
-    number_pattern = r"\d"
-    phone_numbers_list = re.findall(number_pattern, phone_number.replace(" ", ""))
-    cleaned_phone_number = "".join(phone_numbers_list)
+    cleaned_phone_number = phone_number.translate(DECIMAL_DIGITS)
 
-    if len(phone_numbers_list) and phone_numbers_list[0] == "3":
-        return f"{cleaned_phone_number}"
+    if cleaned_phone_number[:1] == "3":
+        return cleaned_phone_number
     else:
         return f"38{cleaned_phone_number}"
 
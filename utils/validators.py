@@ -0,0 +1,52 @@
+"""Validation of field values, shared by the models.
+
+Patterns are compiled once at import instead of on every assignment.
+"""
+
+import re
+from datetime import datetime
+
+from handlers.errors import ValidationError
+from utils.utils import normalize_phone
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+BIRTHDAY_FORMAT = "%d.%m.%Y"
+# The common DD.MM.YYYY shape; anything else is left to strptime
+BIRTHDAY_PATTERN = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", re.ASCII)
+PHONE_LENGTH = 12
+
+
+def validate_phone(phone: str) -> str:
+    """normalize_phone of phone, raising ValidationError unless it is valid"""
+    formatted_phone = normalize_phone(phone)
+
+    if not formatted_phone.isdigit():
+        raise ValidationError("phone", "Expected only digits")
+
+    if len(formatted_phone) != PHONE_LENGTH:
+        raise ValidationError("phone", "Invalid phone number. Format: 380XXXXXXXXX")
+
+    return formatted_phone
+
+
+def validate_email(email: str) -> str:
+    """email itself, raising ValidationError unless it looks like an address"""
+    if (not email) or not bool(email.strip()):
+        raise ValidationError("email", "Please enter email")
+
+    if not EMAIL_PATTERN.match(email):
+        raise ValidationError("email", "Email is not valid")
+
+    return email
+
+
+def parse_birthday(value: str) -> datetime:
+    """datetime of a DD.MM.YYYY string, as datetime.strptime reads it"""
+    match = BIRTHDAY_PATTERN.fullmatch(value)
+    try:
+        if match is None:
+            return datetime.strptime(value, BIRTHDAY_FORMAT)
+        day, month, year = match.groups()
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        raise ValueError("Invalid date format. Use DD.MM.YYYY") from None